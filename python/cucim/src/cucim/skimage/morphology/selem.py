@@ -5,6 +5,54 @@ from cupyx.scipy import ndimage as ndi
 from .._shared.utils import deprecate_kwarg
 
 
+@cp.memoize(for_each_device=True)
+def _get_radial_selem_kernel(metric, ndim):
+    """Kernel generating a centered structuring element of shape
+    ``(2*r + 1,) * ndim`` in a single launch.
+
+    An element belongs to the neighborhood if the city block
+    (``metric='cityblock'``) or squared Euclidean (``metric='sqeuclidean'``)
+    distance to the center is no greater than ``threshold``.
+    """
+    code = """
+    ptrdiff_t idx = i;
+    ptrdiff_t dist = 0;
+    ptrdiff_t c;
+    """
+    # recover the coordinates from the flat (C-order) index
+    for _ in range(ndim):
+        code += """
+    c = idx % n - r;
+    idx /= n;
+    """
+        if metric == 'cityblock':
+            code += "dist += c < 0 ? -c : c;\n"
+        else:
+            code += "dist += c * c;\n"
+    code += "selem = (dist <= threshold) ? 1 : 0;\n"
+    return cp.ElementwiseKernel(
+        'int64 r, int64 n, int64 threshold',
+        'T selem',
+        code,
+        name=f'cucim_skimage_morphology_{metric}_selem_{ndim}d',
+    )
+
+
+def _radial_selem(radius, ndim, metric, dtype):
+    n = 2 * radius + 1
+    out = cp.empty((n,) * ndim, dtype=dtype)
+    threshold = radius if metric == 'cityblock' else radius * radius
+    _get_radial_selem_kernel(metric, ndim)(radius, n, threshold, out)
+    return out
+
+
+def _is_nonnegative_int(radius):
+    try:
+        return radius >= 0 and int(radius) == radius
+    except TypeError:
+        return False
+
+
 def square(width, dtype=np.uint8):
     """Generates a flat, square-shaped structuring element.
 
@@ -90,12 +138,12 @@ def diamond(radius, dtype=np.uint8):
         The structuring element where elements of the neighborhood
         are 1 and 0 otherwise.
     """
-    # CuPy Backend: grid is usually small -> faster to generate it in NumPy
-    L = np.arange(0, radius * 2 + 1)
-    I, J = np.meshgrid(L, L, sparse=True)
-    return cp.asarray(
-        np.abs(I - radius) + np.abs(J - radius) <= radius, dtype=dtype
-    )
+    # CuPy Backend: generate the structuring element on the device in a
+    #               single kernel launch (no host to device copy)
+    if _is_nonnegative_int(radius):
+        return _radial_selem(int(radius), 2, 'cityblock', dtype)
+    I, J = cp.ogrid[-radius:radius + 1, -radius:radius + 1]
+    return cp.asarray(cp.abs(I) + cp.abs(J) <= radius, dtype=dtype)
 
 
 def disk(radius, dtype=np.uint8):
@@ -120,9 +168,11 @@ def disk(radius, dtype=np.uint8):
         The structuring element where elements of the neighborhood
         are 1 and 0 otherwise.
     """
-    # CuPy Backend: grid is usually small -> faster to generate it in NumPy
-    L = np.arange(-radius, radius + 1)
-    X, Y = np.meshgrid(L, L, sparse=True)
+    # CuPy Backend: generate the structuring element on the device in a
+    #               single kernel launch (no host to device copy)
+    if _is_nonnegative_int(radius):
+        return _radial_selem(int(radius), 2, 'sqeuclidean', dtype)
+    Y, X = cp.ogrid[-radius:radius + 1, -radius:radius + 1]
     return cp.asarray((X * X + Y * Y) <= radius * radius, dtype=dtype)
 
 
@@ -226,14 +276,16 @@ def octahedron(radius, dtype=np.uint8):
         are 1 and 0 otherwise.
     """
     # note that in contrast to diamond(), this method allows non-integer radii
+    if _is_nonnegative_int(radius):
+        return _radial_selem(int(radius), 3, 'cityblock', dtype)
     n = 2 * radius + 1
-    Z, Y, X = np.ogrid[
+    Z, Y, X = cp.ogrid[
         -radius:radius:n * 1j,
         -radius:radius:n * 1j,
         -radius:radius:n * 1j,
     ]
-    s = np.abs(X) + np.abs(Y) + np.abs(Z)
-    return cp.array(s <= radius, dtype=dtype)
+    s = cp.abs(X) + cp.abs(Y) + cp.abs(Z)
+    return cp.asarray(s <= radius, dtype=dtype)
 
 
 def ball(radius, dtype=np.uint8):
@@ -259,14 +311,16 @@ def ball(radius, dtype=np.uint8):
         The structuring element where elements of the neighborhood
         are 1 and 0 otherwise.
     """
+    if _is_nonnegative_int(radius):
+        return _radial_selem(int(radius), 3, 'sqeuclidean', dtype)
     n = 2 * radius + 1
-    Z, Y, X = np.ogrid[
+    Z, Y, X = cp.ogrid[
         -radius:radius:n * 1j,
         -radius:radius:n * 1j,
         -radius:radius:n * 1j,
     ]
     s = X * X + Y * Y + Z * Z
-    return cp.array(s <= radius * radius, dtype=dtype)
+    return cp.asarray(s <= radius * radius, dtype=dtype)
 
 
 def octagon(m, n, dtype=np.uint8):
@@ -296,22 +350,16 @@ def octagon(m, n, dtype=np.uint8):
         are 1 and 0 otherwise.
 
     """
-    try:
-        from skimage.morphology import convex_hull_image
-    except ImportError:
-        raise ImportError("octagon requires scikit-image")
-
-    selem = np.zeros((m + 2 * n, m + 2 * n))
-    selem[0, n] = 1
-    selem[n, 0] = 1
-    selem[0, m + n - 1] = 1
-    selem[m + n - 1, 0] = 1
-    selem[-1, n] = 1
-    selem[n, -1] = 1
-    selem[-1, m + n - 1] = 1
-    selem[m + n - 1, -1] = 1
-    selem = convex_hull_image(selem).astype(dtype)
-    return cp.array(selem)
+    # CuPy Backend: evaluate the convex hull of the 8 vertices analytically on
+    #               the device. Each pixel is inside the octagon unless it
+    #               is cut off by one of the 45 degree corner edges.
+    size = m + 2 * n
+    I, J = cp.ogrid[:size, :size]
+    # distance to the closest border along each axis
+    dist_i = cp.minimum(I, size - 1 - I)
+    dist_j = cp.minimum(J, size - 1 - J)
+    selem = dist_i + dist_j >= min(n, m + n - 1)
+    return selem.astype(dtype)
 
 
 def star(a, dtype=np.uint8):
@@ -339,37 +387,26 @@ def star(a, dtype=np.uint8):
         are 1 and 0 otherwise.
 
     """
-    try:
-        from skimage.morphology import convex_hull_image
-    except ImportError:
-        raise ImportError("star requires scikit-image")
-
-    if a == 1:
-        bfilter = np.zeros((3, 3), dtype)
-        bfilter[:] = 1
-        return bfilter
-
+    # CuPy Backend: compute the union of the square and its 45 degree rotated
+    #               version (a diamond) analytically on the device
     m = 2 * a + 1
     n = a // 2
-    selem_square = np.zeros((m + 2 * n, m + 2 * n))
-    selem_square[n:m + n, n:m + n] = 1
-
-    c = (m + 2 * n - 1) // 2
-    selem_rotated = np.zeros((m + 2 * n, m + 2 * n))
-    selem_rotated[0, c] = selem_rotated[-1, c] = 1
-    selem_rotated[c, 0] = selem_rotated[c, -1] = 1
-    selem_rotated = convex_hull_image(selem_rotated).astype(int)
-
-    selem = selem_square + selem_rotated
-    selem[selem > 0] = 1
-
-    return cp.array(selem.astype(dtype, copy=False))
+    size = m + 2 * n
+    c = (size - 1) // 2
+    I, J = cp.ogrid[:size, :size]
+    selem_square = (I >= n) & (I < m + n) & (J >= n) & (J < m + n)
+    selem_rotated = cp.abs(I - c) + cp.abs(J - c) <= c
+    selem = selem_square | selem_rotated
+    return selem.astype(dtype)
 
 
+@cp.memoize(for_each_device=True)
 def _default_selem(ndim):
     """Generates a cross-shaped structuring element (connectivity=1).
 
     This is the default structuring element (selem) if no selem was specified.
+    The result is cached per ``ndim`` (and device), so the returned array is
+    shared between calls and must not be modified in place.
 
     Parameters
     ----------
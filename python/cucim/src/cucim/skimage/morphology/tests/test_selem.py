@@ -8,6 +8,7 @@ Author: Damian Eads
 
 import cupy as cp
 import numpy as np
+import pytest
 from cupy.testing import assert_array_equal
 
 from cucim.skimage._shared.testing import fetch
@@ -82,6 +83,27 @@ class TestSElem:
         self.strel_worker_3d("data/diamond-matlab-output.npz",
                              selem.octahedron)
 
+    @pytest.mark.parametrize(
+        'function, ndim',
+        [(selem.diamond, 2), (selem.disk, 2), (selem.octahedron, 3),
+         (selem.ball, 3)]
+    )
+    @pytest.mark.parametrize('dtype', [bool, cp.uint8, cp.float32])
+    def test_selem_dtype(self, function, ndim, dtype):
+        """Test that the kernel-generated elements honor the dtype"""
+        for radius in range(4):
+            actual_mask = function(radius, dtype=dtype)
+            assert actual_mask.dtype == dtype
+            assert actual_mask.shape == (2 * radius + 1,) * ndim
+            assert_array_equal(actual_mask, function(radius).astype(dtype))
+
+    def test_selem_float_radius(self):
+        """Test that integer-valued float radii match integer radii"""
+        assert_array_equal(selem.diamond(3.0), selem.diamond(3))
+        assert_array_equal(selem.disk(3.0), selem.disk(3))
+        assert_array_equal(selem.octahedron(3.0), selem.octahedron(3))
+        assert_array_equal(selem.ball(3.0), selem.ball(3))
+
     def test_selem_octagon(self):
         """Test octagon structuring elements"""
         # fmt: off
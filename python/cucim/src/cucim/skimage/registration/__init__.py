@@ -1,4 +1,6 @@
 from ._optical_flow import optical_flow_ilk, optical_flow_tvl1  # noqa
-from ._phase_cross_correlation import phase_cross_correlation  # noqa
+from ._phase_cross_correlation import (phase_cross_correlation,  # noqa
+                                       phase_cross_correlation_batch)
 
-__all__ = ["optical_flow_ilk", "optical_flow_tvl1", "phase_cross_correlation"]
+__all__ = ["optical_flow_ilk", "optical_flow_tvl1", "phase_cross_correlation",
+           "phase_cross_correlation_batch"]
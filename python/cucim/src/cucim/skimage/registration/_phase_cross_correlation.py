@@ -3,6 +3,7 @@ Port of Manuel Guizar's code from:
 http://www.mathworks.com/matlabcentral/fileexchange/18401-efficient-subpixel-image-registration-by-cross-correlation
 """
 
+import functools
 import math
 
 import cupy as cp
@@ -11,9 +12,153 @@ import numpy as np
 from .._shared.fft import fftmodule as fft
 from ._masked_phase_cross_correlation import _masked_phase_cross_correlation
 
+# cuFFT plans reused across calls on same-sized inputs. Keyed by (shape,
+# dtype, memory order, output shape, axes, value_type, device). The number of
+# entries is bounded so that registering many differently sized images does
+# not keep an unbounded number of cuFFT work areas alive.
+_fft_plan_cache = {}
+_fft_plan_cache_size = 16
+
+
+def _get_fft_plan(a, shape=None, axes=None, value_type='C2C'):
+    """Return a (cached) cuFFT plan for an n-dimensional FFT over ``a``.
+
+    ``shape``, ``axes`` and ``value_type`` are as for
+    ``cupyx.scipy.fft.get_fft_plan``. Returns None if ``a`` is not a
+    contiguous floating point array or more than 3 axes are transformed
+    (unsupported by cuFFT's n-dimensional plans), in which case CuPy will
+    choose a suitable plan internally.
+    """
+    n_axes = a.ndim if axes is None else len(axes)
+    if n_axes > 3 or a.dtype.kind not in 'fc':
+        return None
+    if a.flags.c_contiguous:
+        order = 'C'
+    elif a.flags.f_contiguous and value_type == 'C2C':
+        order = 'F'
+    else:
+        return None
+    key = (a.shape, a.dtype, order, shape, axes, value_type,
+           cp.cuda.Device().id)
+    plan = _fft_plan_cache.get(key)
+    if plan is None:
+        if len(_fft_plan_cache) >= _fft_plan_cache_size:
+            # evict the oldest entry (dicts preserve insertion order)
+            del _fft_plan_cache[next(iter(_fft_plan_cache))]
+        plan = fft.get_fft_plan(a, shape=shape, axes=axes,
+                                value_type=value_type)
+        _fft_plan_cache[key] = plan
+    return plan
+
+
+def clear_fft_cache():
+    """Release all cuFFT plans cached by ``phase_cross_correlation``."""
+    _fft_plan_cache.clear()
+
+
+# computes a * conj(b) in a single pass (no temporary for conj(b))
+_conj_mul = cp.ElementwiseKernel(
+    in_params="T a, T b",
+    out_params="T c",
+    operation="c = a * conj(b)",
+    name="cucim_skimage_registration_conj_mul",
+)
+
+
+_abs2_argmax_preamble = """
+struct abs2_idx {
+    double v;
+    long long i;
+    __device__ abs2_idx() : v(-1.0), i(0) {}
+    __device__ abs2_idx(double v, long long i) : v(v), i(i) {}
+};
+
+__device__ abs2_idx abs2_idx_max(const abs2_idx& a, const abs2_idx& b) {
+    // same semantics as cupy.argmax: NaN wins, ties go to the first index
+    bool a_nan = isnan(a.v), b_nan = isnan(b.v);
+    if (a_nan != b_nan) return a_nan ? a : b;
+    if (a.v > b.v) return a;
+    if (b.v > a.v) return b;
+    return (a.i < b.i) ? a : b;
+}
+"""
+
+# argmax of |z|**2 in a single pass (no temporary magnitude array). Squared
+# magnitude is used as it has the same maximum location as abs(z).
+_abs2_argmax = cp.ReductionKernel(
+    in_params="T z",
+    out_params="int64 idx",
+    map_expr="abs2_idx(z.real() * z.real() + z.imag() * z.imag(), _J)",
+    reduce_expr="abs2_idx_max(a, b)",
+    post_map_expr="idx = a.i",
+    identity="abs2_idx()",
+    name="cucim_skimage_registration_abs2_argmax",
+    reduce_type="abs2_idx",
+    preamble=_abs2_argmax_preamble,
+)
+
+
+@cp.memoize(for_each_device=True)
+def _get_sum_abs2_kernel(real_type):
+    return cp.ReductionKernel(
+        in_params="T z",
+        out_params=f"{real_type} s",
+        map_expr="z.real() * z.real() + z.imag() * z.imag()",
+        reduce_expr="a + b",
+        post_map_expr="s = a",
+        identity="0",
+        name=f"cucim_skimage_registration_sum_abs2_{real_type}",
+        reduce_type=real_type,
+    )
+
+
+def _sum_abs2(x, axis=None):
+    """Sum of the squared magnitudes of ``x``, computed in a single pass."""
+    if x.dtype.kind != 'c':
+        return cp.sum(cp.square(x), axis=axis)
+    real_type = 'float' if x.dtype == cp.complex64 else 'double'
+    return _get_sum_abs2_kernel(real_type)(x, axis=axis)
+
+
+def _argmax_abs(x, axis=None):
+    """Index of the element of ``x`` with the largest magnitude.
+
+    As for ``cupy.argmax``, the index is into the flattened array if
+    ``axis`` is None.
+    """
+    if x.dtype.kind != 'c':
+        return cp.argmax(cp.abs(x), axis=axis)
+    return _abs2_argmax(x, axis=axis)
+
+
+@functools.lru_cache(maxsize=32)
+def _dft_kernel_tables(shape, ups_size, upsample_factor, inverse, dtype,
+                       device_id):
+    """Offset-independent tables used by ``_upsampled_dft``.
+
+    Returns the DFT sample frequencies of all axes of an array of the given
+    shape (concatenated) and the matching ``exp(-2j*pi*u*f)`` table of shape
+    ``(ups_size, sum(shape))``. The table has the complex ``dtype`` and the
+    frequencies the corresponding real dtype. ``device_id`` is only part of
+    the cache key.
+    """
+    # CuPy Backend: frequencies are usually small -> generate in NumPy
+    freqs = np.concatenate(
+        [np.fft.fftfreq(n_items, upsample_factor) for n_items in shape]
+    )
+    freqs = cp.asarray(freqs)
+    im2pi = 1j * 2 * np.pi
+    if inverse:
+        im2pi = -im2pi
+    kernel = cp.arange(ups_size, dtype=freqs.dtype)[:, None] * freqs
+    kernel = cp.exp(-im2pi * kernel).astype(dtype, copy=False)
+    real_dtype = np.finfo(dtype).dtype
+    return freqs.astype(real_dtype, copy=False), kernel
+
 
 def _upsampled_dft(data, upsampled_region_size,
-                   upsample_factor=1, axis_offsets=None):
+                   upsample_factor=1, axis_offsets=None, inverse=False,
+                   batched=False):
     """
     Upsampled DFT by matrix multiplication.
 
@@ -43,42 +188,171 @@ def _upsampled_dft(data, upsampled_region_size,
     axis_offsets : tuple of integers, optional
         The offsets of the region to be sampled.  Defaults to None (uses
         image center)
+    inverse : bool, optional
+        If True, use a positive exponent in the DFT kernel. This gives the
+        same result as ``_upsampled_dft(data.conj(), ...).conj()`` without
+        the two conjugation passes.
+    batched : bool, optional
+        If True, the first axis of ``data`` indexes independent arrays, each
+        upsampled around its own offsets. The first axis is not transformed
+        and ``axis_offsets`` must have shape ``(data.shape[0], data.ndim - 1)``.
 
     Returns
     -------
     output : ndarray
             The upsampled DFT of the specified region.
     """
+    n_batch_dims = 1 if batched else 0
+    batch_shape = data.shape[:n_batch_dims]
+    shape = data.shape[n_batch_dims:]
+    ndim = len(shape)
+
     # if people pass in an integer, expand it to a list of equal-sized sections
     if not hasattr(upsampled_region_size, "__iter__"):
-        upsampled_region_size = [upsampled_region_size] * data.ndim
+        upsampled_region_size = [upsampled_region_size] * ndim
     else:
-        if len(upsampled_region_size) != data.ndim:
+        if len(upsampled_region_size) != ndim:
             raise ValueError("shape of upsampled region sizes must be equal "
                              "to input data's number of dimensions.")
 
+    # Build the DFT kernels directly in the precision of data (complex64
+    # kernels for single precision data) instead of casting them afterwards
+    complex_dtype = cp.promote_types(data.dtype, cp.complex64)
+    real_dtype = cp.float32 if complex_dtype == cp.complex64 else cp.float64
+
     if axis_offsets is None:
-        axis_offsets = [0] * data.ndim
-    else:
-        if len(axis_offsets) != data.ndim:
-            raise ValueError("number of axis offsets must be equal to input "
-                             "data's number of dimensions.")
+        axis_offsets = [0] * ndim
+    axis_offsets = cp.asarray(axis_offsets, dtype=real_dtype)
+    if axis_offsets.ndim == 0 or axis_offsets.shape[-1] != ndim:
+        raise ValueError("number of axis offsets must be equal to input "
+                         "data's number of dimensions.")
 
     im2pi = 1j * 2 * np.pi
+    if inverse:
+        im2pi = -im2pi
+
+    # The DFT kernel of a singleton axis is all ones, so the DFT along it only
+    # replicates the data. Such axes are left out of the contraction and the
+    # result is broadcast along them at the end instead.
+    axes = [ax for ax in range(ndim) if shape[ax] > 1]
+    full_ups_sizes = tuple(upsampled_region_size)
+    ups_sizes = tuple(full_ups_sizes[ax] for ax in axes)
+    if len(axes) < ndim:
+        shape = tuple(shape[ax] for ax in axes)
+        data = data.reshape(batch_shape + shape)
+        axis_offsets = axis_offsets[..., axes]
+    ndim = len(shape)
+
+    if ndim == 0:
+        kernels = []
+    elif all(u == ups_sizes[0] for u in ups_sizes):
+        # Build the DFT kernels of all axes at once as a single
+        # (ups_size, sum(shape)) array and split it into per-axis views.
+        # The kernel exp(-2j*pi*(u - offset)*f) is factored as the cached,
+        # offset-independent exp(-2j*pi*u*f) times exp(2j*pi*offset*f), so
+        # only a vector of exponentials has to be evaluated per call.
+        freqs, kernel = _dft_kernel_tables(
+            shape, ups_sizes[0], float(upsample_factor), inverse,
+            complex_dtype, cp.cuda.Device().id
+        )
+        offsets = cp.repeat(axis_offsets, list(shape), axis=-1)
+        offsets *= freqs
+        kernel = kernel * cp.exp(im2pi * offsets)[..., cp.newaxis, :]
+        if data.dtype.kind != 'c':
+            kernel = kernel.astype(data.dtype, copy=False)
+        kernels = cp.split(kernel, np.cumsum(shape)[:-1].tolist(), axis=-1)
+    else:
+        kernels = []
+        for ax, (n_items, ups_size) in enumerate(zip(shape, ups_sizes)):
+            freqs = fft.fftfreq(n_items, upsample_factor).astype(real_dtype,
+                                                                 copy=False)
+            kernel = (cp.arange(ups_size, dtype=real_dtype)
+                      - axis_offsets[..., ax, cp.newaxis])
+            kernel = cp.exp(-im2pi * (kernel[..., cp.newaxis] * freqs))
+            if data.dtype.kind != 'c':
+                kernel = kernel.astype(data.dtype, copy=False)
+            kernels.append(kernel)
+
+    # Contract each axis of data with its kernel, starting with the first
+    # axis. With data viewed as a (n_items, M) matrix, each step is a single
+    # GEMM
+    #   data[M, U] = data[n_items, M].T @ kernel[U, n_items].T
+    # whose result has the transformed axis last, so after ndim steps the
+    # axes are back in their original order. No copies are needed and the
+    # GEMM shapes only depend on the data shape, so cuBLAS can reuse the
+    # same kernels across calls.
+    for kernel in kernels:
+        rest_shape = data.shape[n_batch_dims + 1:]
+        data = data.reshape(batch_shape + (data.shape[n_batch_dims], -1))
+        data = cp.matmul(data.swapaxes(-1, -2), kernel.swapaxes(-1, -2))
+        data = data.reshape(batch_shape + rest_shape + (kernel.shape[-2],))
+
+    if len(axes) < len(full_ups_sizes):
+        out_shape = [1] * len(full_ups_sizes)
+        for ax, ups_size in zip(axes, ups_sizes):
+            out_shape[ax] = ups_size
+        data = cp.broadcast_to(data.reshape(batch_shape + tuple(out_shape)),
+                               batch_shape + full_ups_sizes)
+    return data
 
-    dim_properties = list(zip(data.shape, upsampled_region_size, axis_offsets))
 
-    for (n_items, ups_size, ax_offset) in dim_properties[::-1]:
-        kernel = ((cp.arange(ups_size) - ax_offset)[:, None]
-                  * fft.fftfreq(n_items, upsample_factor))
-        kernel = cp.exp(-im2pi * kernel)
-        # CuPy Backend: use kernel of same precision as the data
-        kernel = kernel.astype(data.dtype, copy=False)
+def _hermitian_full_spectrum(half, shape):
+    """Expand the output of ``rfftn`` to the full ``fftn`` spectrum.
 
-        # Equivalent to:
-        #   data[i, j, k] = kernel[i, :] @ data[j, k].T
-        data = cp.tensordot(kernel, data, axes=(1, -1))
-    return data
+    Parameters
+    ----------
+    half : ndarray
+        The non-redundant half of the spectrum of a real-valued array of
+        the given ``shape`` (i.e. as returned by ``rfftn(x, s=shape)``). Any
+        leading axes in excess of ``len(shape)`` are treated as batch axes.
+    shape : tuple of int
+        The shape of the real-valued array.
+
+    Returns
+    -------
+    full : ndarray
+        The full spectrum, equal to ``fftn(x)``.
+    """
+    n = shape[-1]
+    # fftn(x)[k] == conj(fftn(x)[-k]) for real-valued x
+    tail = half[..., (n + 1) // 2 - 1:0:-1].conj()
+    for axis in range(half.ndim - len(shape), half.ndim - 1):
+        tail = cp.roll(cp.flip(tail, axis), 1, axis)
+    return cp.concatenate([half, tail], axis=-1)
+
+
+def _to_single_precision(x):
+    """Convert ``x`` to complex64 if it is complex and to float32 otherwise.
+    """
+    if x.dtype.kind == 'c':
+        return x.astype(cp.complex64, copy=False)
+    return x.astype(cp.float32, copy=False)
+
+
+_abs2_preamble = """
+__device__ float _pcc_abs2(float x) { return x * x; }
+__device__ double _pcc_abs2(double x) { return x * x; }
+template<typename T>
+__device__ T _pcc_abs2(const complex<T>& z) {
+    return z.real() * z.real() + z.imag() * z.imag();
+}
+"""
+
+
+@cp.memoize(for_each_device=True)
+def _get_error_kernel(real_type):
+    # sqrt(abs(1 - |cc|**2 / (sa * ta))) in a single launch. The argument of
+    # the sqrt can be slightly negative due to floating point error.
+    return cp.ElementwiseKernel(
+        in_params="T cc, F sa, F ta",
+        out_params=f"{real_type} e",
+        operation=f"""
+        {real_type} v = 1 - _pcc_abs2(cc) / (sa * ta);
+        e = sqrt(fabs(v));
+        """,
+        name=f"cucim_skimage_registration_error_{real_type}",
+        preamble=_abs2_preamble,
+    )
 
 
 def _compute_phasediff(cross_correlation_max):
@@ -107,16 +381,16 @@ def _compute_error(cross_correlation_max, src_amp, target_amp):
     target_amp : float
         The normalized average image intensity of the target image
     """
-    error = 1.0 - cross_correlation_max * cross_correlation_max.conj() /\
-        (src_amp * target_amp)
-
-    return cp.sqrt(cp.abs(error))
+    real_type = 'float' if src_amp.dtype == cp.float32 else 'double'
+    return _get_error_kernel(real_type)(cross_correlation_max, src_amp,
+                                        target_amp)
 
 
 def phase_cross_correlation(reference_image, moving_image, *,
                             upsample_factor=1, space="real",
                             return_error=True, reference_mask=None,
-                            moving_mask=None, overlap_ratio=0.3):
+                            moving_mask=None, overlap_ratio=0.3,
+                            reduce_precision=False):
     """Efficient subpixel image translation registration by cross-correlation.
 
     This code gives the same precision as the FFT upsampled cross-correlation
@@ -164,6 +438,14 @@ def phase_cross_correlation(reference_image, moving_image, *,
         robustness against spurious matches due to small overlap between
         masked images. Used only if one of ``reference_mask`` or
         ``moving_mask`` is None.
+    reduce_precision : bool, optional
+        If True, double precision (and integer) inputs are converted to
+        single precision before the FFTs are computed. This halves the
+        memory footprint and bandwidth of all FFT and elementwise passes, at
+        the cost of accuracy: the returned shifts are single precision and
+        the attainable subpixel accuracy may be limited for very large
+        ``upsample_factor``. Not used if any of ``reference_mask`` or
+        ``moving_mask`` is not None.
 
     Returns
     -------
@@ -201,43 +483,164 @@ def phase_cross_correlation(reference_image, moving_image, *,
     if reference_image.shape != moving_image.shape:
         raise ValueError("images must be same shape")
 
+    if reduce_precision:
+        reference_image = _to_single_precision(reference_image)
+        moving_image = _to_single_precision(moving_image)
+
+    result = _batched_phase_cross_correlation(
+        reference_image[cp.newaxis], moving_image[cp.newaxis],
+        upsample_factor, space, return_error
+    )
+    if not return_error:
+        return result[0]
+    shifts, error, phasediff = result
+    return shifts[0], error[0], phasediff[0]
+
+
+def phase_cross_correlation_batch(reference_images, moving_images, *,
+                                  upsample_factor=1, space="real",
+                                  return_error=True, reduce_precision=False):
+    """Subpixel translation registration of a stack of image pairs.
+
+    Registers each ``moving_images[i]`` to ``reference_images[i]`` in the
+    same way as :func:`phase_cross_correlation`, but processes all pairs
+    together: the FFTs, peak searches and upsampled DFTs are each done in a
+    single batched call. This is much faster than a Python loop over
+    ``phase_cross_correlation`` for many small images.
+
+    Parameters
+    ----------
+    reference_images : array
+        Stack of reference images. The first axis indexes the images.
+    moving_images : array
+        Stack of images to register. Must have the same shape as
+        ``reference_images``.
+    upsample_factor : int, optional
+        Upsampling factor. Images will be registered to within
+        ``1 / upsample_factor`` of a pixel. Default is 1 (no upsampling).
+    space : string, one of "real" or "fourier", optional
+        Defines how the algorithm interprets input data. "real" means
+        data will be FFT'd to compute the correlation, while "fourier"
+        data will bypass FFT of input data. Case insensitive. For
+        "fourier", each image must already be transformed over all but
+        the first axis.
+    return_error : bool, optional
+        Returns error and phase difference if on, otherwise only
+        shifts are returned.
+    reduce_precision : bool, optional
+        If True, double precision (and integer) inputs are converted to
+        single precision before the FFTs are computed. See
+        :func:`phase_cross_correlation`.
+
+    Returns
+    -------
+    shifts : ndarray
+        Shift vectors (in pixels) required to register each of
+        ``moving_images`` with the corresponding reference image, of shape
+        ``(n_images, reference_images.ndim - 1)``.
+    error : ndarray
+        Translation invariant normalized RMS error of each image pair.
+    phasediff : ndarray
+        Global phase difference of each image pair.
+
+    See Also
+    --------
+    phase_cross_correlation
+    """
+    if reference_images.shape != moving_images.shape:
+        raise ValueError("images must be same shape")
+    if reference_images.ndim < 2:
+        raise ValueError("expected a stack of images with ndim >= 2")
+
+    if reduce_precision:
+        reference_images = _to_single_precision(reference_images)
+        moving_images = _to_single_precision(moving_images)
+
+    return _batched_phase_cross_correlation(
+        reference_images, moving_images, upsample_factor, space, return_error
+    )
+
+
+def _batched_phase_cross_correlation(reference_images, moving_images,
+                                     upsample_factor, space, return_error):
+    """Register ``moving_images[i]`` with ``reference_images[i]`` for all i.
+
+    The first axis indexes the image pairs, all remaining axes are spatial.
+    See ``phase_cross_correlation`` for the other parameters.
+    """
+    n_batch = reference_images.shape[0]
+    shape = reference_images.shape[1:]
+    axes = tuple(range(1, reference_images.ndim))
+    # If True, only the non-redundant half of the (Hermitian) spectra of
+    # real-valued images is computed
+    real_input = False
+
     # assume complex data is already in Fourier space
     if space.lower() == 'fourier':
-        src_freq = reference_image
-        target_freq = moving_image
+        src_freq = reference_images
+        target_freq = moving_images
     # real data needs to be fft'd.
     elif space.lower() == 'real':
-        src_freq = fft.fftn(reference_image)
-        target_freq = fft.fftn(moving_image)
+        if reference_images.dtype.kind != 'c' and \
+                moving_images.dtype.kind != 'c':
+            real_input = True
+            src_freq = fft.rfftn(
+                reference_images, axes=axes,
+                plan=_get_fft_plan(reference_images, axes=axes,
+                                   value_type='R2C')
+            )
+            target_freq = fft.rfftn(
+                moving_images, axes=axes,
+                plan=_get_fft_plan(moving_images, axes=axes,
+                                   value_type='R2C')
+            )
+        else:
+            src_freq = fft.fftn(
+                reference_images, axes=axes,
+                plan=_get_fft_plan(reference_images, axes=axes)
+            )
+            target_freq = fft.fftn(
+                moving_images, axes=axes,
+                plan=_get_fft_plan(moving_images, axes=axes)
+            )
     else:
         raise ValueError('space argument must be "real" of "fourier"')
 
     # Whole-pixel shift - Compute cross-correlation by an IFFT
-    shape = src_freq.shape
-    image_product = src_freq * target_freq.conj()
-    cross_correlation = fft.ifftn(image_product)
+    if src_freq.dtype != target_freq.dtype:
+        dtype = cp.promote_types(src_freq.dtype, target_freq.dtype)
+        src_freq = src_freq.astype(dtype, copy=False)
+        target_freq = target_freq.astype(dtype, copy=False)
+    if src_freq.dtype.kind == 'c':
+        image_product = _conj_mul(src_freq, target_freq)
+    else:
+        image_product = src_freq * target_freq
+    if real_input:
+        cross_correlation = fft.irfftn(
+            image_product, s=shape, axes=axes,
+            plan=_get_fft_plan(image_product, shape=shape, axes=axes,
+                               value_type='C2R')
+        )
+    else:
+        cross_correlation = fft.ifftn(
+            image_product, axes=axes,
+            plan=_get_fft_plan(image_product, axes=axes)
+        )
 
-    # Locate maximum
-    maxima = cp.unravel_index(
-        cp.argmax(cp.abs(cross_correlation)), cross_correlation.shape
-    )
-    midpoints = cp.asarray([np.fix(axis_size / 2) for axis_size in shape])
+    # Locate maximum of each image pair
+    cross_correlation = cross_correlation.reshape(n_batch, -1)
+    peak_idx = _argmax_abs(cross_correlation, axis=1)
+    maxima = cp.unravel_index(peak_idx, shape)
 
     float_dtype = image_product.real.dtype
-    shifts = cp.stack([m.astype(float_dtype, copy=False) for m in maxima])
-    shifts[shifts > midpoints] -= cp.asarray(shape)[shifts > midpoints]
-
-    if upsample_factor == 1:
-        if return_error:
-            sabs = cp.abs(src_freq)
-            sabs *= sabs
-            tabs = cp.abs(target_freq)
-            tabs *= tabs
-            src_amp = np.sum(sabs) / src_freq.size
-            target_amp = np.sum(tabs) / target_freq.size
-            CCmax = cross_correlation[maxima]
+    shifts = cp.asarray(maxima, dtype=float_dtype).T
+    # single host to device copy for both the midpoints and the wrap-around
+    shape_arr = cp.asarray(shape, dtype=float_dtype)
+    midpoints = shape_arr // 2
+    shifts = cp.where(shifts > midpoints, shifts - shape_arr, shifts)
+
     # If upsampling > 1, then refine estimate with matrix multiply DFT
-    else:
+    if upsample_factor != 1:
         # Initial shift estimate in upsampled grid
         shifts = cp.around(shifts * upsample_factor) / upsample_factor
         upsampled_region_size = math.ceil(upsample_factor * 1.5)
@@ -246,49 +649,66 @@ def phase_cross_correlation(reference_image, moving_image, *,
         upsample_factor = float(upsample_factor)
         # Matrix multiply DFT around the current shift estimate
         sample_region_offset = dftshift - shifts * upsample_factor
-        cross_correlation = _upsampled_dft(image_product.conj(),
+        if real_input:
+            image_product = _hermitian_full_spectrum(image_product, shape)
+        cross_correlation = _upsampled_dft(image_product,
                                            upsampled_region_size,
                                            upsample_factor,
-                                           sample_region_offset).conj()
+                                           sample_region_offset,
+                                           inverse=True,
+                                           batched=True)
 
         # Locate maximum and map back to original pixel grid
-        maxima = cp.unravel_index(cp.argmax(cp.abs(cross_correlation)),
-                                  cross_correlation.shape)
-        CCmax = cross_correlation[maxima]
-
-        maxima = (
-            cp.stack([m.astype(float_dtype, copy=False) for m in maxima])
-            - dftshift
-        )
+        upsampled_shape = cross_correlation.shape[1:]
+        cross_correlation = cross_correlation.reshape(n_batch, -1)
+        peak_idx = _argmax_abs(cross_correlation, axis=1)
+        maxima = cp.unravel_index(peak_idx, upsampled_shape)
+        maxima = cp.asarray(maxima, dtype=float_dtype).T - dftshift
 
         shifts = shifts + maxima / upsample_factor
 
-        if return_error:
-            src_amp = cp.abs(src_freq)
-            src_amp *= src_amp
-            src_amp = cp.sum(src_amp)
-            target_amp = cp.abs(target_freq)
-            target_amp *= target_amp
-            target_amp = cp.sum(target_amp)
-
     # If its only one row or column the shift along that dimension has no
     # effect. We set to zero.
-    for dim in range(src_freq.ndim):
+    for dim in range(len(shape)):
         if shape[dim] == 1:
-            shifts[dim] = 0
-
-    if return_error:
-        # Redirect user to masked_phase_cross_correlation if NaNs are observed
-        if cp.isnan(CCmax) or cp.isnan(src_amp) or cp.isnan(target_amp):
-            raise ValueError(
-                "NaN values found, please remove NaNs from your "
-                "input data or use the `reference_mask`/`moving_mask` "
-                "keywords, eg: "
-                "phase_cross_correlation(reference_image, moving_image, "
-                "reference_mask=~np.isnan(reference_image), "
-                "moving_mask=~np.isnan(moving_image))")
-
-        return shifts, _compute_error(CCmax, src_amp, target_amp),\
-            _compute_phasediff(CCmax)
-    else:
+            shifts[:, dim] = 0
+
+    if not return_error:
+        # only the peak location was needed: skip the amplitude reductions
         return shifts
+
+    CCmax = cross_correlation[cp.arange(n_batch), peak_idx]
+    size = int(np.prod(shape))
+    if real_input:
+        # Parseval's theorem: sum(abs(fftn(x))**2) == x.size * sum(x**2)
+        src_amp = _sum_abs2(
+            reference_images.astype(float_dtype, copy=False), axis=axes
+        )
+        target_amp = _sum_abs2(
+            moving_images.astype(float_dtype, copy=False), axis=axes
+        )
+        if upsample_factor != 1:
+            src_amp *= size
+            target_amp *= size
+    else:
+        src_amp = _sum_abs2(src_freq, axis=axes)
+        target_amp = _sum_abs2(target_freq, axis=axes)
+        if upsample_factor == 1:
+            src_amp /= size
+            target_amp /= size
+
+    # Redirect user to masked_phase_cross_correlation if NaNs are observed
+    # (checked with a single device to host transfer)
+    has_nan = (cp.isnan(CCmax).any() | cp.isnan(src_amp).any()
+               | cp.isnan(target_amp).any())
+    if has_nan:
+        raise ValueError(
+            "NaN values found, please remove NaNs from your "
+            "input data or use the `reference_mask`/`moving_mask` "
+            "keywords, eg: "
+            "phase_cross_correlation(reference_image, moving_image, "
+            "reference_mask=~np.isnan(reference_image), "
+            "moving_mask=~np.isnan(moving_image))")
+
+    return shifts, _compute_error(CCmax, src_amp, target_amp),\
+        _compute_phasediff(CCmax)
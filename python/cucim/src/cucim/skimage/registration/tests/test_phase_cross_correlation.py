@@ -8,7 +8,9 @@ from cucim.skimage import img_as_float
 from cucim.skimage._shared.fft import fftmodule as fft
 from cucim.skimage.data import binary_blobs
 from cucim.skimage.registration._phase_cross_correlation import (
-    _upsampled_dft, phase_cross_correlation)
+    _argmax_abs, _compute_error, _fft_plan_cache, _hermitian_full_spectrum,
+    _sum_abs2, _upsampled_dft, clear_fft_cache, phase_cross_correlation,
+    phase_cross_correlation_batch)
 
 
 def test_correlation():
@@ -148,3 +150,152 @@ def test_mismatch_offsets_size():
     with pytest.raises(ValueError):
         _upsampled_dft(cp.ones((4, 4)), 3,
                        axis_offsets=[3, 2, 1, 4])
+
+
+def test_fft_plan_cache():
+    clear_fft_cache()
+    reference_image = cp.array(camera()).astype(cp.float32)
+    shift = (-7, 12)
+    shifted_image = fft.ifftn(
+        fourier_shift(fft.fftn(reference_image), shift)
+    ).real.astype(cp.float32)
+
+    result = phase_cross_correlation(reference_image, shifted_image,
+                                     return_error=False)
+    n_plans = len(_fft_plan_cache)
+    assert n_plans > 0
+
+    # a second call on same-sized inputs reuses the cached plans
+    result2 = phase_cross_correlation(reference_image, shifted_image,
+                                      return_error=False)
+    assert len(_fft_plan_cache) == n_plans
+    assert_allclose(result, result2)
+    assert_allclose(result, -cp.array(shift))
+
+    clear_fft_cache()
+    assert len(_fft_plan_cache) == 0
+
+
+@pytest.mark.parametrize('dtype', [cp.complex64, cp.complex128])
+@pytest.mark.parametrize('shape', [(1,), (33, 17), (8, 9, 10)])
+def test_argmax_abs(dtype, shape):
+    rng = cp.random.RandomState(5)
+    x = rng.standard_normal(shape) + 1j * rng.standard_normal(shape)
+    x = x.astype(dtype)
+    assert int(_argmax_abs(x)) == int(cp.argmax(cp.abs(x)))
+
+
+@pytest.mark.parametrize('dtype', [cp.float32, cp.complex64, cp.complex128])
+def test_sum_abs2(dtype):
+    rng = cp.random.RandomState(5)
+    x = rng.standard_normal((31, 20))
+    if cp.dtype(dtype).kind == 'c':
+        x = x + 1j * rng.standard_normal((31, 20))
+    x = x.astype(dtype)
+    expected = cp.sum(cp.abs(x) ** 2)
+    result = _sum_abs2(x)
+    assert result.dtype == expected.dtype
+    assert_allclose(result, expected, rtol=1e-5)
+
+
+@pytest.mark.parametrize(
+    'dtype', [cp.float32, cp.float64, cp.complex64, cp.complex128]
+)
+def test_compute_error(dtype):
+    rng = cp.random.RandomState(5)
+    cc = rng.standard_normal(8)
+    if cp.dtype(dtype).kind == 'c':
+        cc = cc + 1j * rng.standard_normal(8)
+    cc = cc.astype(dtype)
+    real_dtype = cc.real.dtype
+    src_amp = (2 + rng.uniform(size=8)).astype(real_dtype)
+    target_amp = (2 + rng.uniform(size=8)).astype(real_dtype)
+    expected = cp.sqrt(
+        cp.abs(1.0 - cc * cc.conj() / (src_amp * target_amp))
+    )
+    result = _compute_error(cc, src_amp, target_amp)
+    assert result.dtype == real_dtype
+    assert_allclose(result, expected, rtol=1e-5)
+
+
+@pytest.mark.parametrize('space', ['real', 'fourier'])
+def test_reduce_precision(space):
+    reference_image = cp.array(camera()).astype(cp.float64)
+    subpixel_shift = (-2.4, 1.32)
+    shifted_image = fourier_shift(fft.fftn(reference_image), subpixel_shift)
+    if space == 'real':
+        shifted_image = fft.ifftn(shifted_image).real
+    else:
+        reference_image = fft.fftn(reference_image)
+
+    result, error, diffphase = phase_cross_correlation(reference_image,
+                                                       shifted_image,
+                                                       upsample_factor=100,
+                                                       space=space,
+                                                       reduce_precision=True)
+    assert result.dtype == cp.float32
+    assert_allclose(result[:2], -cp.array(subpixel_shift), atol=0.05)
+
+
+@pytest.mark.parametrize('shape', [(5,), (6,), (1,), (6, 7), (5, 4),
+                                   (3, 4, 5), (4, 1, 2)])
+def test_hermitian_full_spectrum(shape):
+    x = cp.random.RandomState(0).standard_normal(shape)
+    full = _hermitian_full_spectrum(fft.rfftn(x), shape)
+    assert_allclose(full, fft.fftn(x), atol=1e-12)
+
+
+@pytest.mark.parametrize('upsample_factor', [1, 20])
+def test_real_matches_fourier_space(upsample_factor):
+    # the real-valued (rfftn) path must give the same result as passing the
+    # full spectra
+    reference_image = cp.array(camera()).astype(cp.float64)
+    subpixel_shift = (-2.4, 1.32)
+    shifted_image = fourier_shift(fft.fftn(reference_image), subpixel_shift)
+    real_result = phase_cross_correlation(
+        reference_image, fft.ifftn(shifted_image).real,
+        upsample_factor=upsample_factor)
+    fourier_result = phase_cross_correlation(
+        fft.fftn(reference_image), fft.fftn(fft.ifftn(shifted_image).real),
+        upsample_factor=upsample_factor, space="fourier")
+    for r, f in zip(real_result, fourier_result):
+        assert_allclose(r, f, atol=1e-6)
+
+
+@pytest.mark.parametrize('upsample_factor', [1, 20])
+@pytest.mark.parametrize('space', ['real', 'fourier'])
+def test_batch(upsample_factor, space):
+    reference_image = cp.array(camera()).astype(cp.float64)
+    shifts = [(-2.4, 1.32), (0, 0), (5.1, -7.7)]
+    reference_images = cp.stack([reference_image] * len(shifts))
+    moving_images = cp.stack([
+        fft.ifftn(fourier_shift(fft.fftn(reference_image), shift)).real
+        for shift in shifts
+    ])
+    if space == 'fourier':
+        reference_images = fft.fftn(reference_images, axes=(1, 2))
+        moving_images = fft.fftn(moving_images, axes=(1, 2))
+
+    result, error, diffphase = phase_cross_correlation_batch(
+        reference_images, moving_images, upsample_factor=upsample_factor,
+        space=space
+    )
+    assert result.shape == (len(shifts), 2)
+    assert error.shape == diffphase.shape == (len(shifts),)
+    for i in range(len(shifts)):
+        expected = phase_cross_correlation(
+            reference_images[i], moving_images[i],
+            upsample_factor=upsample_factor, space=space
+        )
+        assert_allclose(result[i], expected[0])
+        assert_allclose(error[i], expected[1], atol=1e-6)
+        assert_allclose(diffphase[i], expected[2], atol=1e-6)
+    atol = 0.05 if upsample_factor > 1 else 0.5
+    assert_allclose(result, -cp.array(shifts), atol=atol)
+
+
+def test_batch_wrong_input():
+    with pytest.raises(ValueError):
+        phase_cross_correlation_batch(cp.ones((2, 5, 5)), cp.ones((2, 4, 4)))
+    with pytest.raises(ValueError):
+        phase_cross_correlation_batch(cp.ones((5,)), cp.ones((5,)))
@@ -4,7 +4,7 @@ from ._geometric import (AffineTransform, EssentialMatrixTransform,
                          ProjectiveTransform, SimilarityTransform,
                          estimate_transform, matrix_transform)
 from ._warps import (downscale_local_mean, rescale, resize, rotate, swirl,
-                     warp, warp_coords, warp_polar)
+                     warp, warp_batch, warp_coords, warp_polar)
 from .integral import integral_image, integrate
 from .pyramids import (pyramid_expand, pyramid_gaussian, pyramid_laplacian,
                        pyramid_reduce)
@@ -13,6 +13,7 @@ __all__ = [
     "integral_image",
     "integrate",
     "warp",
+    "warp_batch",
     "warp_coords",
     "warp_polar",
     "estimate_transform",
@@ -0,0 +1,263 @@
+"""Specialized linear interpolation kernels for warps of 2-D images.
+
+These mirror the linear (order 1) interpolation of ``cupyx.scipy.ndimage``.
+``_affine_linear`` takes the affine coefficients as scalar kernel arguments,
+so the matrix never has to be transferred to (or reshaped on) the device.
+``_map_coordinates_linear_bands`` samples all bands of a multichannel image at
+shared 2-D coordinates. The kernels are specialized on the boundary mode and
+the number of bands: each thread computes the coordinates and weights of one
+output pixel and interpolates all of its bands.
+
+The scattered reads of the input go through the read-only data cache (the
+texture cache) via ``__ldg``. Texture objects with hardware filtering are not
+used, as their interpolation weights only have 8 bits of precision.
+"""
+import cupy as cp
+
+# ndimage modes supported by the linear kernels of this module
+_affine_linear_modes = ('constant', 'nearest', 'mirror', 'reflect')
+
+
+def _boundary_ops(mode, ix, xsize):
+    """Map index ``ix`` into ``[0, xsize)`` as ``cupyx.scipy.ndimage`` does."""
+    if mode == 'nearest':
+        return f"""
+        {ix} = min(max({ix}, 0LL), {xsize} - 1);"""
+    elif mode == 'mirror':
+        return f"""
+        if ({xsize} == 1) {{
+            {ix} = 0;
+        }} else {{
+            if ({ix} < 0) {{
+                {ix} = -{ix};
+            }}
+            {ix} = 1 + ({ix} - 1) % (({xsize} - 1) * 2);
+            {ix} = min({ix}, 2 * {xsize} - 2 - {ix});
+        }}"""
+    elif mode == 'reflect':
+        return f"""
+        if ({ix} < 0) {{
+            {ix} = -1 - {ix};
+        }}
+        {ix} %= {xsize} * 2;
+        {ix} = min({ix}, 2 * {xsize} - 1 - {ix});"""
+    raise ValueError(f"unsupported mode: {mode}")
+
+
+def _linear_interpolation_code(mode, n_bands, offset='', bounds_index=None):
+    """Code interpolating ``out[b]`` at the coordinates ``c_0``, ``c_1`` for
+    each of the ``n_bands`` interleaved bands of the raw array ``x`` (starting
+    at ``offset``) as ``cupyx.scipy.ndimage`` does for ``order=1``.
+
+    The number of bands is a compile-time constant, so the band loop is
+    unrolled and the coordinates and weights are shared by all bands.
+
+    Unless ``bounds_index`` is None, the output is clipped to the range stored
+    at that index of the raw ``bounds`` array (as the real and imaginary part
+    of a complex value). In 'constant' mode, outputs equal to an out-of-range
+    ``cval`` are left untouched.
+    """
+    code = [f"""
+    W out[{n_bands}];"""]
+    if mode == 'constant':
+        code.append(f"""
+    if ((c_0 < 0) || (c_0 > xsize_0 - 1) || (c_1 < 0) || (c_1 > xsize_1 - 1))
+    {{
+        for (int b = 0; b < {n_bands}; b++)
+        {{
+            out[b] = cval;
+        }}
+    }}
+    else
+    {{""")
+    strides = (f'xsize_1 * {n_bands}', f'{n_bands}')
+    for j, stride in enumerate(strides):
+        code.append(f"""
+        long long cf_{j} = (long long)floor(c_{j});
+        long long cc_{j} = cf_{j} + 1;
+        int n_{j} = (c_{j} == cf_{j}) ? 1 : 2;  // points needed
+        long long cf_bounded_{j} = cf_{j};
+        long long cc_bounded_{j} = cc_{j};""")
+        if mode != 'constant':
+            code.append(_boundary_ops(mode, f'cf_bounded_{j}', f'xsize_{j}'))
+            code.append(_boundary_ops(mode, f'cc_bounded_{j}', f'xsize_{j}'))
+        # weights and offsets of both neighbors, computed once per axis
+        code.append(f"""
+        const W w_{j}[2] = {{(W)cc_{j} - c_{j}, c_{j} - (W)cf_{j}}};
+        const long long ic_{j}[2] = {{cf_bounded_{j} * {stride},
+                                     cc_bounded_{j} * {stride}}};""")
+    code.append(f"""
+        for (int b = 0; b < {n_bands}; b++)
+        {{
+            out[b] = (W)0.0;
+        }}
+        for (int s_0 = 0; s_0 < n_0; s_0++)
+        {{
+            for (int s_1 = 0; s_1 < n_1; s_1++)
+            {{
+                const long long ic = ic_0[s_0] + ic_1[s_1]{offset};
+                const W w = w_0[s_0] * w_1[s_1];
+                for (int b = 0; b < {n_bands}; b++)
+                {{
+                    // gather through the read-only (texture) data cache
+                    W val = (W)__ldg(&x[ic + b]);
+                    out[b] += val * w;
+                }}
+            }}
+        }}""")
+    if mode == 'constant':
+        code.append("""
+    }""")
+    if bounds_index is not None:
+        # the weights need not sum to exactly one in floating point, so even
+        # linear interpolation can overshoot the input range by rounding
+        preserve_cval = ('!(min_val <= cval && cval <= max_val)'
+                         if mode == 'constant' else 'false')
+        code.append(f"""
+    const W min_val = (W)bounds[{bounds_index}].real();
+    const W max_val = (W)bounds[{bounds_index}].imag();
+    const bool preserve_cval = {preserve_cval};
+    for (int b = 0; b < {n_bands}; b++)
+    {{
+        if (!(preserve_cval && out[b] == cval))
+        {{
+            out[b] = out[b] < min_val ? min_val
+                     : (out[b] > max_val ? max_val : out[b]);
+        }}
+    }}""")
+    code.append(f"""
+    for (int b = 0; b < {n_bands}; b++)
+    {{
+        y[i * {n_bands} + b] = out[b];
+    }}""")
+    return '\n'.join(code)
+
+
+@cp.memoize(for_each_device=True)
+def _get_affine_linear_kernel(mode, n_bands, clip):
+    code = """
+    const long long xsize_0 = x.shape()[0];
+    const long long xsize_1 = x.shape()[1];
+    const long long in_0 = i / out_cols;
+    const long long in_1 = i - in_0 * out_cols;
+    W c_0 = (W)0.0;
+    c_0 += m00 * (W)in_0;
+    c_0 += m01 * (W)in_1;
+    c_0 += m02;
+    W c_1 = (W)0.0;
+    c_1 += m10 * (W)in_0;
+    c_1 += m11 * (W)in_1;
+    c_1 += m12;
+    """
+    code += _linear_interpolation_code(mode, n_bands,
+                                       bounds_index='0' if clip else None)
+    in_params = ('raw X x, W m00, W m01, W m02, W m10, W m11, W m12, '
+                 'W cval, int64 out_cols')
+    if clip:
+        in_params += ', raw complex128 bounds'
+    return cp.ElementwiseKernel(
+        in_params=in_params,
+        out_params='raw W y',
+        operation=code,
+        name=(f'cucim_skimage_transform_affine_linear_{mode}_{n_bands}bands'
+              + ('_clip' if clip else '')),
+    )
+
+
+@cp.memoize(for_each_device=True)
+def _get_map_coordinates_linear_bands_kernel(mode, n_bands, batched, clip):
+    if batched:
+        # x is a stack of images, all sampled at the same coordinates
+        code = f"""
+    const long long xsize_0 = x.shape()[1];
+    const long long xsize_1 = x.shape()[2];
+    const long long frame = i / n_pixels;
+    const long long pixel = i - frame * n_pixels;
+    const long long frame_offset = frame * xsize_0 * xsize_1 * {n_bands};
+    """
+        offset = ' + frame_offset'
+        bounds_index = 'frame'
+        name = 'batch'
+    else:
+        code = """
+    const long long xsize_0 = x.shape()[0];
+    const long long xsize_1 = x.shape()[1];
+    const long long pixel = i;
+    """
+        offset = ''
+        bounds_index = '0'
+        name = 'bands'
+    code += """
+    W c_0 = (W)coords[pixel];
+    W c_1 = (W)coords[pixel + n_pixels];
+    """
+    code += _linear_interpolation_code(mode, n_bands, offset,
+                                       bounds_index if clip else None)
+    in_params = 'raw X x, raw C coords, W cval, int64 n_pixels'
+    if clip:
+        in_params += ', raw complex128 bounds'
+    return cp.ElementwiseKernel(
+        in_params=in_params,
+        out_params='raw W y',
+        operation=code,
+        name=('cucim_skimage_transform_map_coordinates_linear_'
+              f'{name}_{mode}_{n_bands}bands' + ('_clip' if clip else '')),
+    )
+
+
+def _n_bands(image, batched=False):
+    return image.shape[-1] if image.ndim == 3 + batched else 1
+
+
+def _affine_linear(image, matrix, output_shape, mode, cval, dtype=None,
+                   bounds=None):
+    """Linear interpolation of an image under a homogeneous host matrix.
+
+    Equivalent to ``cupyx.scipy.ndimage.affine_transform`` with ``order=1``
+    for a 2-D image and a ``(3, 3)`` NumPy ``matrix`` whose last row is
+    ``(0, 0, 1)``. The bands of a (rows, cols, bands) image are all mapped by
+    the same matrix. The interpolation is done in the floating point
+    ``dtype`` of the output (by default that of ``image``), casting the input
+    values on the fly. If given, the output is clipped to the ``bounds``
+    computed by ``_warps._minmax`` (one complex value holding the minimum and
+    maximum), preserving an out-of-range ``cval`` in 'constant' mode.
+    """
+    image = cp.ascontiguousarray(image)
+    n_bands = _n_bands(image)
+    output_shape = tuple(output_shape[:2]) + image.shape[2:]
+    out = cp.empty(output_shape, dtype=image.dtype if dtype is None else dtype)
+    kernel = _get_affine_linear_kernel(mode, n_bands, bounds is not None)
+    args = (image, *matrix[:2].ravel().tolist(), cval, output_shape[1])
+    if bounds is not None:
+        args += (bounds,)
+    kernel(*args, out, size=out.size // n_bands)
+    return out
+
+
+def _map_coordinates_linear_bands(image, coords, mode, cval, dtype=None,
+                                  batched=False, bounds=None):
+    """Linear interpolation of each band of a (rows, cols, bands) image.
+
+    All bands are sampled at the same ``(2, out_rows, out_cols)`` coordinates
+    in a single kernel launch. Equivalent to calling
+    ``cupyx.scipy.ndimage.map_coordinates`` with ``order=1`` on every band.
+    As for ``_affine_linear``, the output ``dtype`` may differ from the
+    dtype of ``image``. If ``batched`` is True, ``image`` is a stack of 2-D
+    (or multichannel) images that are all sampled at ``coords``. The output
+    is clipped to ``bounds`` as for ``_affine_linear``, with one bounds value
+    per image of a batch.
+    """
+    image = cp.ascontiguousarray(image)
+    coords = cp.ascontiguousarray(coords)
+    n_pixels = coords[0].size
+    n_bands = _n_bands(image, batched)
+    out = cp.empty(image.shape[:batched] + coords.shape[1:]
+                   + image.shape[2 + batched:],
+                   dtype=image.dtype if dtype is None else dtype)
+    kernel = _get_map_coordinates_linear_bands_kernel(mode, n_bands, batched,
+                                                      bounds is not None)
+    args = (image, coords, cval, n_pixels)
+    if bounds is not None:
+        args += (bounds,)
+    kernel(*args, out, size=out.size // n_bands)
+    return out
@@ -12,14 +12,15 @@ from .._shared.utils import get_bound_method_class, safe_as_int
 _sin, _cos = math.sin, math.cos
 
 
+# `numpy.pad` mode names that differ from the corresponding ndimage mode
+_mode_translation_dict = dict(
+    edge="nearest", symmetric="reflect", reflect="mirror"
+)
+
+
 def _to_ndimage_mode(mode):
     """Convert from `numpy.pad` mode name to the corresponding ndimage mode."""
-    mode_translation_dict = dict(
-        edge="nearest", symmetric="reflect", reflect="mirror"
-    )
-    if mode in mode_translation_dict:
-        mode = mode_translation_dict[mode]
-    return mode
+    return _mode_translation_dict.get(mode, mode)
 
 
 def _center_and_normalize_points(points):
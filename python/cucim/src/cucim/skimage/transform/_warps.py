@@ -1,12 +1,18 @@
+import functools
 import math
 
 import cupy as cp
 import numpy as np
 from cupyx.scipy import ndimage as ndi
 
+from .._shared.fft import fftmodule as fft
+from .._shared.fft import next_fast_len
 from .._shared.utils import (_validate_interpolation_order, convert_to_float,
                              safe_as_int, warn)
 from ..measure import block_reduce
+from ..util.dtype import img_as_float32
+from ._affine_kernels import (_affine_linear, _affine_linear_modes,
+                              _map_coordinates_linear_bands)
 from ._geometric import (AffineTransform, ProjectiveTransform,
                          SimilarityTransform, _to_ndimage_mode)
 
@@ -18,9 +24,60 @@ HOMOGRAPHY_TRANSFORMS = (
     ProjectiveTransform,
 )
 
+# numpy.pad modes supported by the anti-aliasing filter of resize and their
+# ndimage equivalents
+_np_pad_to_ndimage = {
+    'constant': 'constant',
+    'edge': 'nearest',
+    'symmetric': 'reflect',
+    'reflect': 'mirror',
+    'wrap': 'wrap'
+}
+
+# numpy.pad modes and their ndimage equivalents for zooms with grid_mode=True
+# (other ndimage modes are passed through unchanged)
+_np_pad_to_ndimage_grid = {
+    'constant': 'grid-constant',
+    'edge': 'nearest',
+    'symmetric': 'reflect',
+    'reflect': 'mirror',
+    'wrap': 'grid-wrap'
+}
+
+
+def _as_float_for_warp(image, preserve_range, allow_float32=False):
+    """Convert an image to floating point prior to interpolation.
+
+    This is ``convert_to_float``, except that with ``allow_float32=True``
+    any input that is not already double precision is converted to
+    ``float32`` instead of ``float64``.
+    """
+    if allow_float32 and image.dtype.char != 'd':
+        if preserve_range:
+            return image.astype(np.float32, copy=False)
+        return img_as_float32(image)
+    return convert_to_float(image, preserve_range)
+
+
+def _as_float_for_warp_deferred(image, preserve_range, allow_float32=False):
+    """As ``_as_float_for_warp``, but possibly deferring the conversion.
+
+    Returns the image and the floating point dtype to interpolate it in. For
+    integer images with ``preserve_range=True`` the conversion is a plain
+    cast, so the image is returned unconverted: the linear interpolation
+    kernels cast the input values on the fly, and other paths convert it to
+    ``dtype`` just before interpolating.
+    """
+    if preserve_range and image.dtype.kind in 'iu':
+        dtype = np.float32 if allow_float32 else np.float64
+        return image, np.dtype(dtype)
+    image = _as_float_for_warp(image, preserve_range, allow_float32)
+    return image, image.dtype
+
 
 def resize(image, output_shape, order=None, mode='reflect', cval=0, clip=True,
-           preserve_range=False, anti_aliasing=None, anti_aliasing_sigma=None):
+           preserve_range=False, anti_aliasing=None, anti_aliasing_sigma=None,
+           allow_float32=False):
     """Resize image to match a certain size.
 
     Performs interpolation to up-size or down-size N-dimensional images. Note
@@ -73,6 +130,10 @@ def resize(image, output_shape, order=None, mode='reflect', cval=0, clip=True,
         By default, this value is chosen as (s - 1) / 2 where s is the
         down-scaling factor, where s > 1. For the up-size case, s < 1, no
         anti-aliasing is performed prior to rescaling.
+    allow_float32 : bool, optional
+        If True, inputs that are not double precision are converted to
+        ``float32`` rather than ``float64``. As the interpolation is memory
+        bound, this roughly doubles its throughput at the cost of precision.
 
     Notes
     -----
@@ -134,42 +195,171 @@ def resize(image, output_shape, order=None, mode='reflect', cval=0, clip=True,
                      "not down-sampling along all axes")
 
         # Translate modes used by np.pad to those used by ndi.gaussian_filter
-        np_pad_to_ndimage = {
-            'constant': 'constant',
-            'edge': 'nearest',
-            'symmetric': 'reflect',
-            'reflect': 'mirror',
-            'wrap': 'wrap'
-        }
         try:
-            ndi_mode = np_pad_to_ndimage[mode]
+            filter_mode = _np_pad_to_ndimage[mode]
         except KeyError:
             raise ValueError("Unknown mode, or cannot translate mode. The "
                              "mode should be one of 'constant', 'edge', "
                              "'symmetric', 'reflect', or 'wrap'. See the "
                              "documentation of numpy.pad for more info.")
-
-        image = ndi.gaussian_filter(image, anti_aliasing_sigma,
-                                    cval=cval, mode=ndi_mode)
+    else:
+        anti_aliasing_sigma = None
 
     order = _validate_interpolation_order(image.dtype, order)
-    ndi_mode = _to_ndimage_mode(mode)
-    # TODO: move the following conversion into _to_ndimage_mode
-    if ndi_mode == 'constant':
-        ndi_mode = 'grid-constant'
-    elif ndi_mode == 'wrap':
-        ndi_mode = 'grid-wrap'
+    ndi_mode = _np_pad_to_ndimage_grid.get(mode, mode)
     zoom_factors = [1 / f for f in factors]
-    image = convert_to_float(image, preserve_range)
+
+    if all(f == 1 for f in factors):
+        # identity: every output pixel coincides with an input pixel, so
+        # neither interpolation nor clipping changes the values
+        out = _as_float_for_warp(image, preserve_range, allow_float32)
+        if out is image or out.base is not None:
+            # do not return (a view of) the input
+            out = out.copy()
+        return out
+
+    # Down-sampling by integer factors where every output pixel coincides
+    # with an input pixel (order 0, or order 1 with odd factors): with
+    # grid_mode=True, output index j samples input index j * f + f // 2, so
+    # the zoom reduces to a strided slice.
+    if anti_aliasing_sigma is None and order <= 1 and all(
+            f >= 1 and f == int(f) and (order == 0 or f % 2 == 1)
+            for f in factors):
+        sl = tuple(slice(int(f) // 2, None, int(f)) for f in factors)
+        out = _as_float_for_warp(image[sl], preserve_range, allow_float32)
+        if out.base is not None:
+            # do not return a view of the input
+            out = out.copy()
+        return out
+
+    # For order 0, and for order 1 outside of 'constant' mode, the output
+    # lies within the range of the filtered image, so the range of the
+    # unfiltered image can be used for clipping and the full resolution
+    # filtered image never has to be formed.
+    if (anti_aliasing_sigma is not None and image.dtype.char in 'fd'
+            and (order == 0 or (order == 1 and mode != 'constant'))):
+        image = _as_float_for_warp(image, preserve_range, allow_float32)
+        out = _antialiased_zoom(image, zoom_factors, anti_aliasing_sigma,
+                                order, filter_mode, ndi_mode, cval)
+        _clip_warp_output(image, out, order, mode, cval, clip)
+        return out
+
+    if anti_aliasing_sigma is not None:
+        for axis, sigma in enumerate(anti_aliasing_sigma):
+            image = _gaussian_filter1d(image, sigma, axis, filter_mode, cval)
+
+    image = _as_float_for_warp(image, preserve_range, allow_float32)
     out = ndi.zoom(image, zoom_factors, order=order, mode=ndi_mode,
                    cval=cval, grid_mode=True)
     _clip_warp_output(image, out, order, mode, cval, clip)
     return out
 
 
+@functools.lru_cache(maxsize=64)
+def _gaussian_kernel1d(sigma, truncate, dtype, device_id):
+    """Truncated 1-D Gaussian kernel (as in ``ndi.gaussian_filter1d``).
+
+    The kernel is cached so that repeated calls to ``resize`` do not
+    rebuild it and transfer it to the device every time.
+    """
+    radius = int(truncate * sigma + 0.5)
+    x = np.arange(-radius, radius + 1)
+    phi_x = np.exp(-0.5 / (sigma * sigma) * x * x)
+    phi_x /= phi_x.sum()
+    return cp.asarray(phi_x, dtype=dtype)
+
+
+@functools.lru_cache(maxsize=64)
+def _gaussian_kernel1d_rfft(sigma, truncate, n, dtype, device_id):
+    """Real FFT of the zero-padded (to length ``n``) Gaussian kernel."""
+    weights = _gaussian_kernel1d(sigma, truncate, dtype, device_id)
+    return fft.rfft(weights, n=n)
+
+
+# Kernels with more taps than this are applied via FFT convolution
+_FFT_GAUSSIAN_MIN_TAPS = 33
+
+# ndimage boundary modes and their numpy.pad equivalents
+_ndimage_to_np_pad = {
+    'constant': 'constant',
+    'nearest': 'edge',
+    'reflect': 'symmetric',
+    'mirror': 'reflect',
+    'wrap': 'wrap',
+}
+
+
+def _gaussian_filter1d_fft(image, sigma, axis, mode, cval, truncate,
+                           device_id):
+    """FFT based equivalent of ``ndi.correlate1d`` with a Gaussian kernel."""
+    radius = int(truncate * sigma + 0.5)
+    pad_width = [(0, 0)] * image.ndim
+    pad_width[axis] = (radius, radius)
+    if mode == 'constant':
+        padded = cp.pad(image, pad_width, mode='constant',
+                        constant_values=cval)
+    else:
+        padded = cp.pad(image, pad_width, mode=_ndimage_to_np_pad[mode])
+    n = next_fast_len(padded.shape[axis])
+    kernel_f = _gaussian_kernel1d_rfft(sigma, truncate, n, image.dtype,
+                                       device_id)
+    kernel_shape = [1] * image.ndim
+    kernel_shape[axis] = kernel_f.size
+    out = fft.irfft(fft.rfft(padded, n=n, axis=axis)
+                    * kernel_f.reshape(kernel_shape), n=n, axis=axis)
+    # the first 2 * radius samples of the circular convolution are invalid
+    sl = [slice(None)] * image.ndim
+    sl[axis] = slice(2 * radius, 2 * radius + image.shape[axis])
+    return out[tuple(sl)]
+
+
+def _gaussian_filter1d(image, sigma, axis, mode, cval, truncate=4.0):
+    """Gaussian smoothing along a single axis (a no-op for ``sigma == 0``)."""
+    if sigma <= 0:
+        return image
+    sigma = float(sigma)
+    dtype = np.float32 if image.dtype == np.float32 else np.float64
+    device_id = cp.cuda.Device().id
+    if (image.dtype.char in 'fd'
+            and 2 * int(truncate * sigma + 0.5) + 1 >= _FFT_GAUSSIAN_MIN_TAPS):
+        # for long kernels, O(n log n) FFT convolution beats O(n * taps)
+        return _gaussian_filter1d_fft(image, sigma, axis, mode, cval,
+                                      truncate, device_id)
+    weights = _gaussian_kernel1d(sigma, truncate, dtype, device_id)
+    # the kernel is symmetric, so correlation and convolution coincide
+    return ndi.correlate1d(image, weights, axis=axis, mode=mode, cval=cval)
+
+
+def _antialiased_zoom(image, zoom_factors, sigma, order, filter_mode,
+                      zoom_mode, cval):
+    """Gaussian smoothing followed by ``ndi.zoom`` for ``order <= 1``.
+
+    Interpolation of order 0 or 1 is separable, so each down-sampled axis is
+    decimated directly after it has been smoothed. The filter passes along
+    the remaining axes then run on the reduced array instead of on the full
+    resolution one.
+    """
+    zoom_factors = list(zoom_factors)
+    zoomed = False
+    for axis, (s, z) in enumerate(zip(sigma, zoom_factors)):
+        image = _gaussian_filter1d(image, s, axis, filter_mode, cval)
+        if z < 1:
+            axis_factors = [1] * image.ndim
+            axis_factors[axis] = z
+            image = ndi.zoom(image, axis_factors, order=order,
+                             mode=zoom_mode, cval=cval, grid_mode=True)
+            zoom_factors[axis] = 1
+            zoomed = True
+    if not zoomed or any(z != 1 for z in zoom_factors):
+        # zoom any up-sampled axes (also ensures the output is a new array)
+        image = ndi.zoom(image, zoom_factors, order=order, mode=zoom_mode,
+                         cval=cval, grid_mode=True)
+    return image
+
+
 def rescale(image, scale, order=None, mode='reflect', cval=0, clip=True,
             preserve_range=False, multichannel=False,
-            anti_aliasing=None, anti_aliasing_sigma=None):
+            anti_aliasing=None, anti_aliasing_sigma=None, allow_float32=False):
     """Scale image by a certain factor.
 
     Performs interpolation to up-scale or down-scale N-dimensional images.
@@ -223,6 +413,10 @@ def rescale(image, scale, order=None, mode='reflect', cval=0, clip=True,
         Standard deviation for Gaussian filtering to avoid aliasing artifacts.
         By default, this value is chosen as (s - 1) / 2 where s is the
         down-scaling factor.
+    allow_float32 : bool, optional
+        If True, inputs that are not double precision are converted to
+        ``float32`` rather than ``float64``. As the interpolation is memory
+        bound, this roughly doubles its throughput at the cost of precision.
 
     Notes
     -----
@@ -251,19 +445,22 @@ def rescale(image, scale, order=None, mode='reflect', cval=0, clip=True,
                              "axis")
         if multichannel:
             scale = np.concatenate((scale, [1]))
-    orig_shape = np.asarray(image.shape)
-    output_shape = np.round(scale * orig_shape)
+    else:
+        scale = np.repeat(scale, image.ndim)
+    # Python's round, like np.round, rounds half to even
+    output_shape = [round(s * d) for s, d in zip(scale.tolist(), image.shape)]
     if multichannel:  # don't scale channel dimension
-        output_shape[-1] = orig_shape[-1]
+        output_shape[-1] = image.shape[-1]
 
-    return resize(image, output_shape, order=order, mode=mode, cval=cval,
-                  clip=clip, preserve_range=preserve_range,
+    return resize(image, tuple(output_shape), order=order, mode=mode,
+                  cval=cval, clip=clip, preserve_range=preserve_range,
                   anti_aliasing=anti_aliasing,
-                  anti_aliasing_sigma=anti_aliasing_sigma)
+                  anti_aliasing_sigma=anti_aliasing_sigma,
+                  allow_float32=allow_float32)
 
 
 def _ndimage_affine(image, matrix, output_shape, order, mode, cval, clip,
-                    preserve_range):
+                    preserve_range, allow_float32=False):
     """Thin wrapper around scipy.ndimage.affine_transform
 
     Validates input and handles clipping of output in the same way as ``warp``.
@@ -277,31 +474,77 @@ def _ndimage_affine(image, matrix, output_shape, order, mode, cval, clip,
     if image.dtype.kind == "c":
         if not preserve_range:
             raise NotImplementedError("TODO")
+        float_dtype = image.dtype
     else:
-        image = convert_to_float(image, preserve_range)
+        image, float_dtype = _as_float_for_warp_deferred(
+            image, preserve_range, allow_float32
+        )
 
     input_shape = image.shape
 
     if output_shape is None:
         output_shape = input_shape
     else:
-        output_shape = safe_as_int(output_shape)
+        output_shape = _as_int_shape(output_shape)
+
+    return _affine_transform(image, matrix, output_shape, order, mode, cval,
+                             clip, float_dtype)
+
+
+def _as_int_shape(shape):
+    """``shape`` as a tuple of Python ints, validated as by ``safe_as_int``.
+
+    Shapes that already consist of integers skip the NumPy round trip.
+    """
+    if all(isinstance(s, (int, np.integer)) for s in shape):
+        return tuple(int(s) for s in shape)
+    return tuple(int(s) for s in safe_as_int(shape))
+
+
+def _use_linear_kernels(order, dtype, ndi_mode):
+    """Whether the specialized kernels of ``_affine_kernels`` apply."""
+    return (order == 1 and dtype.char in 'fd'
+            and ndi_mode in _affine_linear_modes)
+
+
+def _is_affine_matrix(matrix):
+    return (isinstance(matrix, np.ndarray) and matrix.shape == (3, 3)
+            and np.array_equal(matrix[2], (0, 0, 1)))
+
 
+def _affine_transform(image, matrix, output_shape, order, mode, cval, clip,
+                      dtype):
+    """ndi.affine_transform of an image in floating point (or complex) dtype.
+
+    A host ``matrix`` for a 2-D image is interpolated with a specialized
+    kernel where possible. Otherwise, ``image`` is first converted to
+    ``dtype``. The output is clipped as by ``_clip_warp_output``.
+    """
     # Pre-filtering not necessary for order 0, 1 interpolation
     prefilter = order > 1
 
     ndi_mode = _to_ndimage_mode(mode)
-    warped = ndi.affine_transform(image, matrix, prefilter=prefilter,
-                                  mode=ndi_mode, order=order, cval=cval,
-                                  output_shape=tuple(output_shape))
-
+    output_shape = tuple(int(s) for s in output_shape)
+    if (image.ndim == 2 and _use_linear_kernels(order, dtype, ndi_mode)
+            and _is_affine_matrix(matrix)):
+        # CuPy Backend: the coefficients of a host matrix are passed as kernel
+        #               arguments, avoiding the device-side matrix setup of
+        #               ndi.affine_transform. The output is clipped by the
+        #               kernel itself.
+        bounds = _minmax(image).reshape(1) if clip else None
+        return _affine_linear(image, matrix, output_shape, ndi_mode, cval,
+                              dtype, bounds=bounds)
+    image = image.astype(dtype, copy=False)
+    warped = ndi.affine_transform(image, cp.asarray(matrix),
+                                  prefilter=prefilter, mode=ndi_mode,
+                                  order=order, cval=cval,
+                                  output_shape=output_shape)
     _clip_warp_output(image, warped, order, mode, cval, clip)
-
     return warped
 
 
 def _ndimage_rotate(image, angle, resize, order, mode, cval, clip,
-                    preserve_range):
+                    preserve_range, allow_float32=False):
     """Thin wrapper around scipy.ndimage.rotate
 
     Validates input and handles clipping of output in the same way as ``warp``.
@@ -316,7 +559,7 @@ def _ndimage_rotate(image, angle, resize, order, mode, cval, clip,
         if not preserve_range:
             raise NotImplementedError("TODO")
     else:
-        image = convert_to_float(image, preserve_range)
+        image = _as_float_for_warp(image, preserve_range, allow_float32)
 
     # Pre-filtering not necessary for order 0, 1 interpolation
     prefilter = order > 1
@@ -328,8 +571,60 @@ def _ndimage_rotate(image, angle, resize, order, mode, cval, clip,
     return warped
 
 
+def _rotation_affine_for_ndimage(theta, center, resize, shape):
+    """Homogeneous matrix mapping output (row, col) to input coordinates.
+
+    The matrix is computed on the host with NumPy. It is the inverse of a
+    counter-clockwise rotation by ``theta`` radians about ``center`` (given in
+    (col, row) order), with the axes swapped to match
+    ``cupyx.scipy.ndimage.affine_transform``. If ``resize`` is True, the
+    output shape that fits the complete rotated image is returned as well
+    (otherwise None).
+    """
+    rows, cols = shape
+    cos, sin = math.cos(theta), math.sin(theta)
+    # CuPy Backend: the 3x3 matrix is formed directly rather than by
+    #               composing SimilarityTransform objects. In (col, row)
+    #               coordinates the inverse map is a rotation about center.
+    output_shape = None
+    origin = (0, 0)
+    if resize:
+        # determine shape of output image
+        # fmt: off
+        corners = np.array([
+            [0, 0],
+            [0, rows - 1],
+            [cols - 1, rows - 1],
+            [cols - 1, 0]
+        ])
+        # fmt: on
+        rotation_inv = np.array([[cos, sin], [-sin, cos]])
+        corners = (corners - center) @ rotation_inv.T + center
+        minc, minr = corners.min(axis=0)
+        maxc, maxr = corners.max(axis=0)
+        out_rows = maxr - minr + 1
+        out_cols = maxc - minc + 1
+        output_shape = np.around((out_rows, out_cols))
+
+        # fit output image in new shape
+        origin = (minc, minr)
+
+    # translation mapping the output origin to the input image
+    dc = origin[0] - center[0]
+    dr = origin[1] - center[1]
+    tc = center[0] + cos * dc - sin * dr
+    tr = center[1] + sin * dc + cos * dr
+
+    # axes swapped to match cupyx.scipy.ndimage.affine_transform
+    matrix = np.array([[cos, sin, tr],
+                       [-sin, cos, tc],
+                       [0, 0, 1]])
+    return matrix, output_shape
+
+
 def rotate(image, angle, resize=False, center=None, order=None,
-           mode='constant', cval=0, clip=True, preserve_range=False):
+           mode='constant', cval=0, clip=True, preserve_range=False,
+           allow_float32=False):
     """Rotate image by a certain angle around its center.
 
     Parameters
@@ -374,6 +669,10 @@ def rotate(image, angle, resize=False, center=None, order=None,
         image is converted according to the conventions of `img_as_float`.
         Also see
         https://scikit-image.org/docs/dev/user_guide/data_types.html
+    allow_float32 : bool, optional
+        If True, inputs that are not double precision are converted to
+        ``float32`` rather than ``float64``. As the interpolation is memory
+        bound, this roughly doubles its throughput at the cost of precision.
 
     Notes
     -----
@@ -410,53 +709,18 @@ def rotate(image, angle, resize=False, center=None, order=None,
         # can use cupyx.scipy.ndimage.rotate
         return _ndimage_rotate(
             image, angle, resize, order=order, mode=mode, cval=cval, clip=clip,
-            preserve_range=preserve_range
+            preserve_range=preserve_range, allow_float32=allow_float32
         )
 
-    # rotation around center
-    tform1 = SimilarityTransform(translation=center, xp=np)
-    tform2 = SimilarityTransform(rotation=np.deg2rad(angle), xp=np)
-    tform3 = SimilarityTransform(translation=-center, xp=np)
-    tform = tform3 + tform2 + tform1
-
-    output_shape = None
-    if resize:
-        # determine shape of output image
-        # fmt: off
-        corners = np.array([
-            [0, 0],
-            [0, rows - 1],
-            [cols - 1, rows - 1],
-            [cols - 1, 0]
-        ])
-        # fmt: on
-        corners = tform.inverse(corners)
-        minc = corners[:, 0].min()
-        minr = corners[:, 1].min()
-        maxc = corners[:, 0].max()
-        maxr = corners[:, 1].max()
-        out_rows = maxr - minr + 1
-        out_cols = maxc - minc + 1
-        output_shape = np.around((out_rows, out_cols))
-
-        # fit output image in new shape
-        translation = (minc, minr)
-        tform4 = SimilarityTransform(translation=translation, xp=np)
-        tform = tform4 + tform
-
-    # Make sure the transform is exactly affine, to ensure fast warping.
-    tform.params[2] = (0, 0, 1)
-
-    # swap axes in the matrix to match cupyx.scipy.ndimage.affine_transform
-    tform.params[:2, :2] = tform.params[:2, :2].T
-    tform.params[:2, 2] = tform.params[1::-1, 2]
-
-    # transfer the coordinate transform to the GPU
-    tform.params = cp.asarray(tform.params)
-
+    matrix, output_shape = _rotation_affine_for_ndimage(
+        math.radians(angle), center, resize, (rows, cols)
+    )
+    # Note: the matrix stays on the host; _ndimage_affine only transfers it to
+    #       the GPU if the specialized order 1 kernel cannot be used.
     return _ndimage_affine(
-        image, tform.params, output_shape=output_shape, order=order,
-        mode=mode, cval=cval, clip=clip, preserve_range=preserve_range
+        image, matrix, output_shape=output_shape, order=order,
+        mode=mode, cval=cval, clip=clip, preserve_range=preserve_range,
+        allow_float32=allow_float32
     )
 
 
@@ -508,23 +772,38 @@ def downscale_local_mean(image, factors, cval=0, clip=True):
     return block_reduce(image, factors, cp.mean, cval)
 
 
+_swirl_mapping_kernel = cp.ElementwiseKernel(
+    in_params="T x0, T y0, T rotation, T strength, T radius",
+    out_params="raw T xy",
+    operation="""
+    // read both coordinates before overwriting them in place
+    T x = xy[2 * i];
+    T y = xy[2 * i + 1];
+    T xdiff = x - x0;
+    T ydiff = y - y0;
+    T rho = sqrt(xdiff * xdiff + ydiff * ydiff);
+    T theta = rotation + strength * exp(-rho / radius) + atan2(ydiff, xdiff);
+    xy[2 * i] = x0 + rho * cos(theta);
+    xy[2 * i + 1] = y0 + rho * sin(theta);
+    """,
+    name="cucim_skimage_transform_swirl_mapping",
+)
+
+
 def _swirl_mapping(xy, center, rotation, strength, radius):
-    x, y = xy.T
     x0, y0 = center
-    xdiff = x - x0
-    ydiff = y - y0
-    rho = cp.sqrt(xdiff * xdiff + ydiff * ydiff)
 
     # Ensure that the transformation decays to approximately 1/1000-th
     # within the specified radius.
     radius = radius / 5 * math.log(2)
 
-    theta = rotation + strength * cp.exp(-rho / radius)
-    theta += cp.arctan2(ydiff, xdiff)
-
-    xy[..., 0] = x0 + rho * cp.cos(theta)
-    xy[..., 1] = y0 + rho * cp.sin(theta)
-
+    # CuPy Backend: evaluate the whole mapping in a single kernel launch that
+    #               updates the interleaved (x, y) pairs in place. Passing the
+    #               overlapping views xy[..., 0] and xy[..., 1] as both inputs
+    #               and outputs would make CuPy copy the inputs first.
+    xy = cp.ascontiguousarray(xy)
+    _swirl_mapping_kernel(float(x0), float(y0), rotation, strength, radius,
+                          xy, size=xy.size // 2)
     return xy
 
 
@@ -592,27 +871,34 @@ def swirl(image, center=None, strength=1, radius=100, rotation=0,
                 clip=clip, preserve_range=preserve_range)
 
 
-def _stackcopy(a, b):
-    """Copy b into each color layer of a, such that::
+_warp_coords_kernel = cp.ElementwiseKernel(
+    in_params="raw F tf_coords, int64 n_pixels, int64 n_bands",
+    out_params="T coords",
+    operation="""
+    ptrdiff_t plane = i / (n_pixels * n_bands);
+    if (plane == 2) {
+        coords = (T)(i % n_bands);
+    } else {
+        // tf_coords holds (col, row) pairs; plane 0 takes the rows
+        ptrdiff_t pixel = (i / n_bands) % n_pixels;
+        coords = (T)tf_coords[2 * pixel + 1 - plane];
+    }
+    """,
+    name="cucim_skimage_transform_warp_coords",
+)
 
-      a[:,:,0] = a[:,:,1] = ... = b
 
-    Parameters
-    ----------
-    a : (M, N) or (M, N, P) ndarray
-        Target array.
-    b : (M, N)
-        Source array.
-
-    Notes
-    -----
-    Color images are stored as an ``(M, N, 3)`` or ``(M, N, 4)`` arrays.
-
-    """
-    if a.ndim == 3:
-        a[:] = b[:, :, np.newaxis]
-    else:
-        a[:] = b
+# writes the (col, row) pair of each pixel of a (rows, cols) grid into an
+# interleaved (rows * cols, 2) buffer
+_fill_xy_kernel = cp.ElementwiseKernel(
+    in_params="int64 cols",
+    out_params="raw T xy",
+    operation="""
+    xy[2 * i] = (T)(i % cols);
+    xy[2 * i + 1] = (T)(i / cols);
+    """,
+    name="cucim_skimage_transform_fill_xy",
+)
 
 
 def warp_coords(coord_map, shape, dtype=np.float64):
@@ -627,7 +913,10 @@ def warp_coords(coord_map, shape, dtype=np.float64):
     shape : tuple
         Shape of output image ``(rows, cols[, bands])``.
     dtype : np.dtype or string
-        dtype for return value (sane choices: float32 or float64).
+        dtype for return value (sane choices: float32 or float64). float32
+        halves the size of the coordinate array and represents all integer
+        pixel positions exactly for images with fewer than 2**24 rows and
+        columns.
 
     Returns
     -------
@@ -673,28 +962,118 @@ def warp_coords(coord_map, shape, dtype=np.float64):
         coords_shape.append(shape[2])
     coords = cp.empty(coords_shape, dtype=dtype)
 
-    # Reshape grid coordinates into a (P, 2) array of (row, col) pairs
-    tf_coords = cp.indices((cols, rows), dtype=dtype).reshape(2, -1).T
+    # Build a contiguous (P, 2) array of (col, row) pairs in row-major order,
+    # so that no transposes are needed before or after the mapping
+    tf_coords = cp.empty((rows * cols, 2), dtype=dtype)
+    _fill_xy_kernel(cols, tf_coords, size=rows * cols)
 
-    # Map each (row, col) pair to the source image according to
+    # Map each (col, row) pair to the source image according to
     # the user-provided mapping
     tf_coords = coord_map(tf_coords)
 
-    # Reshape back to a (2, M, N) coordinate grid
-    tf_coords = tf_coords.T.reshape((-1, cols, rows)).swapaxes(1, 2)
+    # Write the row, column (and band) coordinate planes in a single pass
+    tf_coords = cp.ascontiguousarray(tf_coords)
+    n_bands = shape[2] if len(shape) == 3 else 1
+    _warp_coords_kernel(tf_coords, rows * cols, n_bands, coords)
 
-    # Place the y-coordinate mapping
-    _stackcopy(coords[1, ...], tf_coords[0, ...])
+    return coords
 
-    # Place the x-coordinate mapping
-    _stackcopy(coords[0, ...], tf_coords[1, ...])
 
-    if len(shape) == 3:
-        coords[2, ...] = cp.arange(shape[2], dtype=coords.dtype)
+# source coordinates of a homography given by the (col, row) homogeneous
+# matrix m, laid out as the output of warp_coords
+_homography_coords_kernel = cp.ElementwiseKernel(
+    in_params=("float64 m00, float64 m01, float64 m02, float64 m10, "
+               "float64 m11, float64 m12, float64 m20, float64 m21, "
+               "float64 m22, int64 cols, int64 n_pixels, int64 n_bands"),
+    out_params="T coords",
+    operation="""
+    ptrdiff_t plane = i / (n_pixels * n_bands);
+    if (plane == 2) {
+        coords = (T)(i % n_bands);
+    } else {
+        ptrdiff_t pixel = (i / n_bands) % n_pixels;
+        double row = (double)(pixel / cols);
+        double col = (double)(pixel % cols);
+        double w = m20 * col + m21 * row + m22;
+        if (w == 0) {
+            // as ProjectiveTransform, avoid a division by zero
+            w = 2.220446049250313e-16;
+        }
+        if (plane == 0) {
+            coords = (T)((m10 * col + m11 * row + m12) / w);
+        } else {
+            coords = (T)((m00 * col + m01 * row + m02) / w);
+        }
+    }
+    """,
+    name="cucim_skimage_transform_homography_coords",
+)
+
 
+def _homography_coords(matrix, shape, dtype):
+    """``warp_coords`` for the homography given by a host (3, 3) ``matrix``.
+
+    The coordinates are computed by a single kernel, without forming the
+    intermediate (P, 2) arrays of a callable coordinate map.
+    """
+    rows, cols = shape[0], shape[1]
+    n_bands = shape[2] if len(shape) == 3 else 1
+    coords = cp.empty((len(shape),) + tuple(shape), dtype=dtype)
+    _homography_coords_kernel(*matrix.ravel().tolist(), cols, rows * cols,
+                              n_bands, coords)
     return coords
 
 
+_minmax_preamble = """
+#include <cupy/math_constants.h>
+
+struct minmax_pair {
+    double mn, mx;
+    __device__ minmax_pair() : mn(CUDART_INF), mx(-CUDART_INF) {}
+    __device__ minmax_pair(double mn, double mx) : mn(mn), mx(mx) {}
+};
+
+__device__ minmax_pair minmax_pair_reduce(const minmax_pair& a,
+                                          const minmax_pair& b) {
+    // NaN propagates, as for cupy.min and cupy.max
+    return minmax_pair(
+        (a.mn < b.mn || isnan(a.mn)) ? a.mn : b.mn,
+        (a.mx > b.mx || isnan(a.mx)) ? a.mx : b.mx);
+}
+"""
+
+# minimum and maximum in a single pass, returned as the real and imaginary
+# part of a single complex value so that they stay on the device
+_minmax = cp.ReductionKernel(
+    in_params="T x",
+    out_params="complex128 bounds",
+    map_expr="minmax_pair(x, x)",
+    reduce_expr="minmax_pair_reduce(a, b)",
+    post_map_expr="bounds = complex<double>(a.mn, a.mx)",
+    identity="minmax_pair()",
+    name="cucim_skimage_transform_minmax",
+    reduce_type="minmax_pair",
+    preamble=_minmax_preamble,
+)
+
+# in-place clip to the bounds computed by _minmax. In 'constant' mode, values
+# equal to an out-of-range cval are left untouched.
+_clip_preserve_cval = cp.ElementwiseKernel(
+    in_params="complex128 bounds, T cval, bool constant_mode",
+    out_params="T x",
+    operation="""
+    T min_val = (T)bounds.real();
+    T max_val = (T)bounds.imag();
+    bool preserve_cval = constant_mode
+                         && !(min_val <= cval && cval <= max_val);
+    if (!(preserve_cval && x == cval)) {
+        x = x < min_val ? min_val : (x > max_val ? max_val : x);
+    }
+    """,
+    name="cucim_skimage_transform_clip_preserve_cval",
+)
+
+
 def _clip_warp_output(input_image, output_image, order, mode, cval, clip):
     """Clip output image to range of values of input image.
 
@@ -725,24 +1104,144 @@ def _clip_warp_output(input_image, output_image, order, mode, cval, clip):
         produce values outside the given input range.
 
     """
-    if clip and order != 0:
-        min_val = input_image.min()
-        max_val = input_image.max()
+    # Nearest neighbor interpolation only copies input values. (Linear
+    # interpolation can still overshoot by rounding, as its weights need not
+    # sum to exactly one in floating point.)
+    if not clip or order == 0:
+        return
+
+    if (input_image.dtype.char in 'fd'
+            and output_image.dtype == input_image.dtype):
+        # CuPy Backend: one reduction for both bounds and one clipping
+        #               kernel, without synchronizing with the host
+        bounds = _minmax(input_image)
+        _clip_preserve_cval(bounds, cval, mode == 'constant',
+                            output_image)
+        return
+
+    min_val = input_image.min()
+    max_val = input_image.max()
+
+    preserve_cval = (mode == 'constant' and not
+                     (min_val <= cval <= max_val))
+
+    if preserve_cval:
+        cval_mask = output_image == cval
+
+    cp.clip(output_image, min_val, max_val, out=output_image)
+
+    if preserve_cval:
+        output_image[cval_mask] = cval
+
+
+def _homography_matrix(inverse_map):
+    """Host copy of the (3, 3) matrix applied by ``inverse_map``.
+
+    Returns None unless ``inverse_map`` is a homogeneous 2-D transformation
+    matrix, a projective transform or the inverse method of one.
+    """
+    if isinstance(inverse_map, cp.ndarray):
+        matrix = inverse_map if inverse_map.shape == (3, 3) else None
+    elif isinstance(inverse_map, HOMOGRAPHY_TRANSFORMS):
+        matrix = inverse_map.params
+    elif (getattr(inverse_map, '__name__', None) == 'inverse'
+            and isinstance(getattr(inverse_map, '__self__', None),
+                           HOMOGRAPHY_TRANSFORMS)):
+        matrix = inverse_map.__self__._inv_matrix
+    else:
+        return None
+    if matrix is None or matrix.shape != (3, 3):
+        return None
+    # Note: the (small) matrix is copied to the host so that its coefficients
+    #       can be inspected and passed on as kernel arguments
+    return cp.asnumpy(matrix).astype(np.float64, copy=False)
+
+
+def _integer_shift(matrix):
+    """(row, col) shift if the (row, col) affine ``matrix`` is an integer
+    translation (or the identity), otherwise None."""
+    shift = matrix[:2, 2]
+    if (np.array_equal(matrix[:2, :2], np.eye(2))
+            and np.array_equal(shift, np.round(shift))
+            and np.all(np.abs(shift) < 2 ** 53)):
+        return tuple(int(t) for t in shift)
+    return None
+
+
+def _shift_image(image, shift, output_shape, mode, cval, dtype):
+    """Warp of ``image`` by an integer (row, col) ``shift``.
+
+    The output pixels sample the input at integer positions, where any
+    interpolation reproduces the input values, so the output is a slice of
+    the input, padded according to ``mode`` where it extends beyond the
+    input. This holds for the modes whose ndimage extension matches
+    ``numpy.pad`` at integer positions ('constant', 'edge', 'symmetric' and
+    'reflect', but not 'wrap').
+    """
+    pad_width = []
+    slices = []
+    for t, out_size, size in zip(shift, output_shape, image.shape):
+        before = max(0, -t)
+        after = max(0, t + out_size - size)
+        pad_width.append((before, after))
+        slices.append(slice(t + before, t + before + out_size))
+    if any(before or after for before, after in pad_width):
+        pad_width += [(0, 0)] * (image.ndim - 2)
+        if mode == 'constant':
+            image = cp.pad(image.astype(dtype, copy=False), pad_width,
+                           mode=mode, constant_values=cval)
+        else:
+            image = cp.pad(image, pad_width, mode=mode)
+    return image[tuple(slices)].astype(dtype)
+
+
+def _bands_are_separable(order, mode):
+    """Whether ``_warp_bands`` matches the 3-D interpolation of ``warp``.
+
+    For ``order > 1`` the spline prefilter of a 3-D interpolation also acts
+    along the band axis. As the bands are sampled at integer positions, its
+    effect cancels out exactly, unless the spline boundary condition is only
+    approximate (ndimage's 'reflect', used for mode 'symmetric') or differs
+    from the extension of the image (mode 'wrap').
+    """
+    return order <= 1 or _to_ndimage_mode(mode) in ('constant', 'nearest',
+                                                    'mirror')
 
-        preserve_cval = (mode == 'constant' and not
-                         (min_val <= cval <= max_val))
 
-        if preserve_cval:
-            cval_mask = output_image == cval
+def _warp_bands(image, coords, output_shape, order, mode, cval, clip,
+                dtype):
+    """Warp each band of a (rows, cols, bands) image with shared coordinates.
 
-        cp.clip(output_image, min_val, max_val, out=output_image)
+    ``coords`` has shape ``(2, rows, cols)``. Where ``_bands_are_separable``,
+    this is identical to sampling every band at its own (integer) band index
+    in a 3-D interpolation, which would need a ``(3, rows, cols, bands)``
+    coordinate array (and, for ``order=3``, 64 rather than 16 taps per
+    output value). The interpolation is done in (floating point) ``dtype``.
+    """
+    ndi_mode = _to_ndimage_mode(mode)
+    if _use_linear_kernels(order, dtype, ndi_mode):
+        # CuPy Backend: interpolate (and clip) all bands in a single kernel
+        #               launch
+        bounds = _minmax(image).reshape(1) if clip else None
+        return _map_coordinates_linear_bands(image, coords, ndi_mode, cval,
+                                             dtype, bounds=bounds)
+
+    image = image.astype(dtype, copy=False)
+    warped = cp.empty(output_shape, dtype=image.dtype)
+    for band in range(output_shape[2]):
+        ndi.map_coordinates(image[..., band], coords,
+                            output=warped[..., band],
+                            prefilter=order > 1, mode=ndi_mode,
+                            order=order, cval=cval)
+
+    _clip_warp_output(image, warped, order, mode, cval, clip)
 
-        if preserve_cval:
-            output_image[cval_mask] = cval
+    return warped
 
 
 def warp(image, inverse_map, map_args={}, output_shape=None, order=None,
-         mode='constant', cval=0., clip=True, preserve_range=False):
+         mode='constant', cval=0., clip=True, preserve_range=False,
+         allow_float32=False):
     """Warp an image according to a given coordinate transformation.
 
     Parameters
@@ -812,6 +1311,10 @@ def warp(image, inverse_map, map_args={}, output_shape=None, order=None,
         image is converted according to the conventions of `img_as_float`.
         Also see
         https://scikit-image.org/docs/dev/user_guide/data_types.html
+    allow_float32 : bool, optional
+        If True, inputs that are not double precision are converted to
+        ``float32`` rather than ``float64``. As the interpolation is memory
+        bound, this roughly doubles its throughput at the cost of precision.
 
     Returns
     -------
@@ -892,19 +1395,60 @@ def warp(image, inverse_map, map_args={}, output_shape=None, order=None,
     if image.dtype.kind == "c":
         if not preserve_range:
             raise NotImplementedError("TODO")
+        float_dtype = image.dtype
     else:
-        image = convert_to_float(image, preserve_range)
+        image, float_dtype = _as_float_for_warp_deferred(
+            image, preserve_range, allow_float32
+        )
 
-    input_shape = np.array(image.shape)
+    input_shape = image.shape
 
     if output_shape is None:
         output_shape = input_shape
     else:
-        output_shape = safe_as_int(output_shape)
+        output_shape = _as_int_shape(output_shape)
+
+    ndi_mode = _to_ndimage_mode(mode)
+    # host copy of the matrix of a homography (or None)
+    matrix = None if map_args else _homography_matrix(inverse_map)
+    # (with 'symmetric' mode, the approximate spline boundary conditions of
+    # order > 1 do not reproduce the input values exactly)
+    if (_is_affine_matrix(matrix)
+            and mode in ('constant', 'edge', 'symmetric', 'reflect')
+            and (order <= 1 or mode != 'symmetric')
+            and image.ndim in (2, 3) and len(output_shape) in (2, image.ndim)
+            and output_shape[2:] in ((), image.shape[2:])):
+        shift = _integer_shift(matrix[(1, 0, 2), :][:, (1, 0, 2)])
+        if shift is not None and all(
+            abs(t) <= size for t, size in zip(shift, image.shape)
+        ):
+            # CuPy Backend: the identity or an integer translation moves
+            #               whole pixels, so the output is a (padded) slice
+            #               of the input and no interpolation is needed
+            return _shift_image(image, shift, output_shape[:2], mode, cval,
+                                float_dtype)
+    if _is_affine_matrix(matrix) and (
+        (image.ndim == 2 and len(output_shape) == 2)
+        # the bands of a multichannel image share the (row, col) transform
+        or (image.ndim == 3 and len(output_shape) in (2, 3)
+            and output_shape[2:] in ((), image.shape[2:])
+            and _use_linear_kernels(order, float_dtype, ndi_mode))
+    ):
+        # CuPy Backend: an affine inverse map is applied by
+        #               ndi.affine_transform (with the axes swapped to
+        #               (row, col) order), so no coordinate array is ever
+        #               formed.
+        matrix = matrix[(1, 0, 2), :][:, (1, 0, 2)]
+        if image.ndim == 3:
+            bounds = _minmax(image).reshape(1) if clip else None
+            return _affine_linear(image, matrix, output_shape, ndi_mode,
+                                  cval, float_dtype, bounds=bounds)
+        return _affine_transform(image, matrix, output_shape, order, mode,
+                                 cval, clip, float_dtype)
 
     if isinstance(inverse_map, cp.ndarray) and inverse_map.shape == (3, 3,):
-        # inverse_map is a transformation matrix as numpy array,
-        # this is only used for order >= 4.
+        # inverse_map is a transformation matrix as numpy array; it is only
+        # called if map_args are given (see _homography_coords otherwise)
         inverse_map = ProjectiveTransform(matrix=inverse_map)
 
     if isinstance(inverse_map, cp.ndarray):
@@ -930,12 +1474,40 @@ def warp(image, inverse_map, map_args={}, output_shape=None, order=None,
             output_shape = (output_shape[0], output_shape[1],
                             input_shape[2])
 
-        coords = warp_coords(coord_map, output_shape)
+        # CuPy Backend: map_coordinates interpolates in the precision of the
+        #               (floating point) image, so build the coordinates in
+        #               that precision too. For float32 images this halves
+        #               the size of the coordinate array.
+        if float_dtype.char in 'fd':
+            coords_dtype = float_dtype
+        else:
+            coords_dtype = np.float64
+
+        def get_coords(shape):
+            if matrix is not None:
+                # CuPy Backend: the coordinates of a homography are computed
+                #               by a single kernel (for any order)
+                return _homography_coords(matrix, shape, coords_dtype)
+            return warp_coords(coord_map, shape, dtype=coords_dtype)
+
+        if (image.ndim == 3 and len(output_shape) == 3
+                and output_shape[2] == input_shape[2]
+                and _bands_are_separable(order, mode)):
+            # CuPy Backend: all bands share the same (row, col) source
+            #               coordinates. Rather than materializing them for
+            #               every band, map the 2-D coordinates onto each
+            #               band in turn.
+            coords = get_coords(output_shape[:2])
+            return _warp_bands(image, coords, output_shape, order,
+                               mode, cval, clip, float_dtype)
+
+        coords = get_coords(output_shape)
+
+    image = image.astype(float_dtype, copy=False)
 
     # Pre-filtering not necessary for order 0, 1 interpolation
     prefilter = order > 1
 
-    ndi_mode = _to_ndimage_mode(mode)
     warped = ndi.map_coordinates(image, coords, prefilter=prefilter,
                                  mode=ndi_mode, order=order, cval=cval)
 
@@ -944,6 +1516,221 @@ def warp(image, inverse_map, map_args={}, output_shape=None, order=None,
     return warped
 
 
+def warp_batch(images, inverse_map, map_args={}, output_shape=None,
+               order=None, mode='constant', cval=0., clip=True,
+               preserve_range=False, allow_float32=False):
+    """Warp a stack of images according to a common coordinate transformation.
+
+    Equivalent to calling `warp` on every image of the stack, but the
+    coordinates of the inverse map are computed only once.
+
+    Parameters
+    ----------
+    images : ndarray
+        Stack of input images, of shape ``(N, rows, cols)`` for gray-scale
+        images or ``(N, rows, cols, bands)`` for multichannel images.
+    inverse_map : transformation object, callable ``cr = f(cr, **kwargs)``, or ndarray
+        Inverse coordinate map, which transforms coordinates in the output
+        images into their corresponding coordinates in the input images. This
+        can be a transformation object, a ``(3, 3)`` homogeneous
+        transformation matrix, a callable acting on ``(M, 2)`` arrays of
+        ``(col, row)`` coordinates or an array of ``(row, col)`` coordinates
+        of shape ``(2, rows, cols)``. See `warp` for details.
+    map_args : dict, optional
+        Keyword arguments passed to `inverse_map`.
+    output_shape : tuple (rows, cols), optional
+        Shape of each output image. By default the shape of the input images
+        is preserved.
+
+    Returns
+    -------
+    warped : double ndarray
+        The stack of warped images.
+
+    Other parameters
+    ----------------
+    order, mode, cval, clip, preserve_range, allow_float32
+        See `warp`.
+
+    Examples
+    --------
+    >>> import cupy as cp
+    >>> from cucim.skimage.transform import SimilarityTransform, warp_batch
+    >>> frames = cp.random.rand(8, 64, 64)
+    >>> tform = SimilarityTransform(rotation=0.1, translation=(2, -3))
+    >>> warp_batch(frames, tform).shape
+    (8, 64, 64)
+
+    """  # noqa
+    if images.ndim not in (3, 4):
+        raise ValueError("images must be a stack of 2-D images (grayscale or "
+                         "color) of shape (N, rows, cols[, bands]).")
+    if images.size == 0:
+        raise ValueError("Cannot warp empty images with dimensions",
+                         images.shape)
+
+    order = _validate_interpolation_order(images.dtype, order)
+
+    if images.dtype.kind == "c":
+        if not preserve_range:
+            raise NotImplementedError("TODO")
+        float_dtype = images.dtype
+    else:
+        images, float_dtype = _as_float_for_warp_deferred(
+            images, preserve_range, allow_float32
+        )
+
+    matrix = None if map_args else _homography_matrix(inverse_map)
+    if isinstance(inverse_map, cp.ndarray) and matrix is None:
+        # coordinates given directly
+        if inverse_map.ndim != 3 or inverse_map.shape[0] != 2:
+            raise ValueError("Coordinates must be of shape (2, rows, cols).")
+        coords = inverse_map
+    else:
+        if output_shape is None:
+            output_shape = images.shape[1:3]
+        else:
+            output_shape = _as_int_shape(output_shape)[:2]
+
+        if float_dtype.char in 'fd':
+            coords_dtype = float_dtype
+        else:
+            coords_dtype = np.float64
+        # CuPy Backend: the coordinates are shared by all images of the
+        #               stack, so they are computed once.
+        if matrix is not None:
+            coords = _homography_coords(matrix, output_shape, coords_dtype)
+        else:
+            def coord_map(*args):
+                return inverse_map(*args, **map_args)
+
+            coords = warp_coords(coord_map, output_shape, dtype=coords_dtype)
+
+    ndi_mode = _to_ndimage_mode(mode)
+    if _use_linear_kernels(order, float_dtype, ndi_mode):
+        # CuPy Backend: interpolate (and clip) the whole stack in a single
+        #               kernel launch, with the bounds of each image
+        #               reduced at once
+        bounds = None
+        if clip:
+            bounds = _minmax(images.reshape(len(images), -1), axis=1)
+        return _map_coordinates_linear_bands(images, coords, ndi_mode, cval,
+                                             float_dtype, batched=True,
+                                             bounds=bounds)
+
+    output_shape = (images.shape[0],) + coords.shape[1:] + images.shape[3:]
+    warped = cp.empty(output_shape, dtype=float_dtype)
+    separable = _bands_are_separable(order, mode)
+    if images.ndim == 4 and not separable:
+        # the spline prefilter acts along the band axis as well, as in warp
+        n_bands = images.shape[3]
+        frame_coords = cp.empty((3,) + output_shape[1:], dtype=coords.dtype)
+        frame_coords[:2] = coords[..., cp.newaxis]
+        frame_coords[2] = cp.arange(n_bands, dtype=coords.dtype)
+    else:
+        frame_coords = coords
+
+    for image, out in zip(images, warped):
+        if image.ndim == 3 and separable:
+            out[...] = _warp_bands(image, coords, out.shape, order, mode,
+                                   cval, clip, float_dtype)
+            continue
+        image = image.astype(float_dtype, copy=False)
+        ndi.map_coordinates(image, frame_coords, output=out,
+                            prefilter=order > 1, mode=ndi_mode, order=order,
+                            cval=cval)
+        _clip_warp_output(image, out, order, mode, cval, clip)
+
+    return warped
+
+
+_sincos_preamble = """
+// sine and cosine of the same angle with a shared argument reduction
+__device__ inline void polar_sincos(float a, float* s, float* c) {
+    sincosf(a, s, c);
+}
+
+__device__ inline void polar_sincos(double a, double* s, double* c) {
+    sincos(a, s, c);
+}
+"""
+
+
+def _get_polar_mapping_kernel(scaling):
+    """Kernel mapping interleaved (col, row) output coordinates of a polar
+    warp to (col, row) input coordinates."""
+    if scaling == 'linear':
+        radius = "xy[2 * i] * inv_k_radius"
+    else:
+        radius = "exp(xy[2 * i] * inv_k_radius)"
+    return cp.ElementwiseKernel(
+        in_params=("raw T xy, T inv_k_angle, T inv_k_radius, T center_r, "
+                   "T center_c"),
+        out_params="raw T coords",
+        operation=f"""
+        T angle = xy[2 * i + 1] * inv_k_angle;
+        T r = {radius};
+        T s, c;
+        polar_sincos(angle, &s, &c);
+        coords[2 * i] = r * c + center_c;
+        coords[2 * i + 1] = r * s + center_r;
+        """,
+        name=f"cucim_skimage_transform_{scaling}_polar_mapping",
+        preamble=_sincos_preamble,
+    )
+
+
+_linear_polar_mapping_kernel = _get_polar_mapping_kernel('linear')
+_log_polar_mapping_kernel = _get_polar_mapping_kernel('log')
+
+
+def _get_polar_coords_kernel(scaling):
+    """Kernel writing the (2, rows, cols) input coordinates of a polar warp
+    (the output of ``warp_coords`` for the polar mapping) directly."""
+    if scaling == 'linear':
+        radius = "(T)col * inv_k_radius"
+    else:
+        radius = "exp((T)col * inv_k_radius)"
+    return cp.ElementwiseKernel(
+        in_params=("T inv_k_angle, T inv_k_radius, T center_r, T center_c, "
+                   "int64 cols, int64 n_pixels"),
+        out_params="raw T coords",
+        operation=f"""
+        // a single integer division for both indices
+        const long long row = i / cols;
+        const long long col = i - row * cols;
+        T angle = (T)row * inv_k_angle;
+        T r = {radius};
+        T s, c;
+        polar_sincos(angle, &s, &c);
+        coords[i] = r * s + center_r;
+        coords[i + n_pixels] = r * c + center_c;
+        """,
+        name=f"cucim_skimage_transform_{scaling}_polar_coords",
+        preamble=_sincos_preamble,
+    )
+
+
+_polar_coords_kernels = {
+    'linear': _get_polar_coords_kernel('linear'),
+    'log': _get_polar_coords_kernel('log'),
+}
+
+
+def _polar_mapping(kernel, output_coords, k_angle, k_radius, center):
+    # CuPy Backend: compute both coordinates in a single kernel launch that
+    #               writes the interleaved (M, 2) output directly (no
+    #               temporaries and no column_stack)
+    if output_coords.dtype.kind != 'f':
+        output_coords = output_coords.astype(cp.float64)
+    output_coords = cp.ascontiguousarray(output_coords)
+    coords = cp.empty_like(output_coords)
+    kernel(output_coords, 1 / float(k_angle), 1 / float(k_radius),
+           float(center[0]), float(center[1]), coords,
+           size=output_coords.shape[0])
+    return coords
+
+
 def _linear_polar_mapping(output_coords, k_angle, k_radius, center):
     """Inverse mapping function to convert from Cartesian to polar coordinates
 
@@ -968,11 +1755,8 @@ def _linear_polar_mapping(output_coords, k_angle, k_radius, center):
         `(M, 2)` array of `(col, row)` coordinates in the input image that
         correspond to the `output_coords` given as input.
     """
-    angle = output_coords[:, 1] / k_angle
-    rr = ((output_coords[:, 0] / k_radius) * cp.sin(angle)) + center[0]
-    cc = ((output_coords[:, 0] / k_radius) * cp.cos(angle)) + center[1]
-    coords = cp.column_stack((cc, rr))
-    return coords
+    return _polar_mapping(_linear_polar_mapping_kernel, output_coords,
+                          k_angle, k_radius, center)
 
 
 def _log_polar_mapping(output_coords, k_angle, k_radius, center):
@@ -999,11 +1783,8 @@ def _log_polar_mapping(output_coords, k_angle, k_radius, center):
         `(M, 2)` array of `(col, row)` coordinates in the input image that
         correspond to the `output_coords` given as input.
     """
-    angle = output_coords[:, 1] / k_angle
-    rr = ((cp.exp(output_coords[:, 0] / k_radius)) * cp.sin(angle)) + center[0]
-    cc = ((cp.exp(output_coords[:, 0] / k_radius)) * cp.cos(angle)) + center[1]
-    coords = cp.column_stack((cc, rr))
-    return coords
+    return _polar_mapping(_log_polar_mapping_kernel, output_coords,
+                          k_angle, k_radius, center)
 
 
 def warp_polar(image, center=None, *, radius=None, output_shape=None,
@@ -1073,16 +1854,19 @@ def warp_polar(image, center=None, *, radius=None, output_shape=None,
                          "when `multichannel=True`,"
                          " got {}".format(image.ndim))
 
+    # CuPy Backend: the scalar parameters of the mapping are computed with
+    #               the math module rather than via small NumPy arrays, as
+    #               their overhead matters for small (e.g. thumbnail) warps
     if center is None:
-        center = (np.array(image.shape)[:2] / 2) - 0.5
+        center = (image.shape[0] / 2 - 0.5, image.shape[1] / 2 - 0.5)
 
     if radius is None:
-        w, h = np.array(image.shape)[:2] / 2
-        radius = np.sqrt(w ** 2 + h ** 2)
+        w, h = image.shape[0] / 2, image.shape[1] / 2
+        radius = math.sqrt(w ** 2 + h ** 2)
 
     if output_shape is None:
         height = 360
-        width = int(np.ceil(radius))
+        width = int(math.ceil(radius))
         output_shape = (height, width)
     else:
         output_shape = safe_as_int(output_shape)
@@ -1098,10 +1882,94 @@ def warp_polar(image, center=None, *, radius=None, output_shape=None,
     else:
         raise ValueError("Scaling value must be in {'linear', 'log'}")
 
-    k_angle = height / (2 * np.pi)
-    warp_args = {'k_angle': k_angle, 'k_radius': k_radius, 'center': center}
+    k_angle = height / (2 * math.pi)
+
+    order = kwargs.pop('order', None)
+    if (image.ndim == 3 and order is not None
+            and not _bands_are_separable(order, kwargs.get('mode',
+                                                           'constant'))):
+        # the spline prefilter along the channel axis requires warp's 3-D
+        # coordinates
+        warp_args = {'k_angle': k_angle, 'k_radius': k_radius,
+                     'center': center}
+        return warp(image, map_func, map_args=warp_args,
+                    output_shape=output_shape, order=order, **kwargs)
+    order = _validate_interpolation_order(image.dtype, order)
+
+    # CuPy Backend: the coordinates only depend on the parameters of the
+    #               mapping, so they are cached for repeated calls (e.g. for
+    #               each frame of a video) and shared between channels.
+    def get_coords(dtype):
+        return _polar_coords(
+            (int(height), int(width)), float(k_angle), float(k_radius),
+            (float(center[0]), float(center[1])), scaling, dtype.char,
+            cp.cuda.Device().id
+        )
+
+    return _warp_2d_coords(image, get_coords, order, **kwargs)
+
 
-    warped = warp(image, map_func, map_args=warp_args,
-                  output_shape=output_shape, **kwargs)
+@functools.lru_cache(maxsize=4)
+def _polar_coords(output_shape, k_angle, k_radius, center, scaling, dtype,
+                  device_id):
+    """(2, rows, cols) source coordinates of a polar warp.
+
+    Equivalent to ``warp_coords`` with the polar mapping, but the coordinate
+    planes are written by a single kernel without any intermediate (M, 2)
+    arrays. The returned array is cached, so it must not be modified.
+    """
+    rows, cols = output_shape
+    coords = cp.empty((2, rows, cols), dtype=dtype)
+    _polar_coords_kernels[scaling](1 / k_angle, 1 / k_radius, center[0],
+                                   center[1], cols, rows * cols, coords,
+                                   size=rows * cols)
+    return coords
+
+
+def _warp_2d_coords(image, get_coords, order, mode='constant', cval=0.,
+                    clip=True, preserve_range=False, allow_float32=False):
+    """Warp a 2-D image (or each channel of a 3-D one) to 2-D coordinates.
+
+    ``get_coords(dtype)`` returns the ``(2, rows, cols)`` source coordinates
+    of the output pixels as an array of the given floating point dtype.
+    Otherwise this behaves as ``warp``, but ``order`` must have been
+    validated already and the bands of a 3-D image must be separable (see
+    ``_bands_are_separable``).
+    """
+    if image.size == 0:
+        raise ValueError("Cannot warp empty image with dimensions",
+                         image.shape)
+
+    if image.dtype.kind == "c":
+        if not preserve_range:
+            raise NotImplementedError("TODO")
+        float_dtype = image.dtype
+    else:
+        image, float_dtype = _as_float_for_warp_deferred(
+            image, preserve_range, allow_float32
+        )
+
+    # map_coordinates interpolates in the precision of the image, so single
+    # precision coordinates suffice for float32 images (and halve the memory
+    # traffic of reading them)
+    if float_dtype == np.float32:
+        coords = get_coords(np.dtype(np.float32))
+    else:
+        coords = get_coords(np.dtype(np.float64))
+
+    if image.ndim == 3:
+        return _warp_bands(image, coords, coords.shape[1:] + image.shape[2:],
+                           order, mode, cval, clip, float_dtype)
+
+    image = image.astype(float_dtype, copy=False)
+
+    # Pre-filtering not necessary for order 0, 1 interpolation
+    prefilter = order > 1
+
+    ndi_mode = _to_ndimage_mode(mode)
+    warped = ndi.map_coordinates(image, coords, prefilter=prefilter,
+                                 mode=ndi_mode, order=order, cval=cval)
+
+    _clip_warp_output(image, warped, order, mode, cval, clip)
 
     return warped
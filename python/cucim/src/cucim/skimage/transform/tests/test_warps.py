@@ -2,6 +2,7 @@ import cupy as cp
 import numpy as np
 import pytest
 from cupy.testing import assert_array_almost_equal, assert_array_equal
+from cupyx.scipy import ndimage as ndi
 from cupyx.scipy.ndimage import map_coordinates
 from numpy.testing import assert_almost_equal, assert_equal
 from skimage.color.colorconv import rgb2gray
@@ -12,12 +13,20 @@ from cucim.skimage._shared._warnings import expected_warnings
 from cucim.skimage.feature.peak import peak_local_max
 from cucim.skimage.transform._geometric import (AffineTransform,
                                                 ProjectiveTransform,
-                                                SimilarityTransform)
-from cucim.skimage.transform._warps import (_linear_polar_mapping,
-                                            _log_polar_mapping, _stackcopy,
+                                                SimilarityTransform,
+                                                _to_ndimage_mode)
+from cucim.skimage.transform._warps import (_clip_warp_output,
+                                            _gaussian_filter1d,
+                                            _linear_polar_mapping,
+                                            _homography_coords,
+                                            _log_polar_mapping,
+                                            _polar_coords,
+                                            _rotation_affine_for_ndimage,
+                                            _swirl_mapping,
                                             downscale_local_mean, rescale,
                                             resize, rotate, swirl, warp,
-                                            warp_coords, warp_polar)
+                                            warp_batch, warp_coords,
+                                            warp_polar)
 from cucim.skimage.util.dtype import img_as_float
 
 # from skimage._shared.testing import test_parallel
@@ -26,15 +35,6 @@ from cucim.skimage.util.dtype import img_as_float
 cp.random.seed(0)
 
 
-def test_stackcopy():
-    layers = 4
-    x = cp.empty((3, 3, layers))
-    y = cp.eye(3, 3)
-    _stackcopy(x, y)
-    for i in range(layers):
-        assert_array_almost_equal(x[..., i], y)
-
-
 def test_warp_tform():
     x = cp.zeros((5, 5), dtype=np.double)
     x[2, 2] = 1
@@ -63,6 +63,32 @@ def test_warp_callable():
     assert_array_almost_equal(outx, refx)
 
 
+@pytest.mark.parametrize('order', [0, 1, 3])
+@pytest.mark.parametrize(
+    'mode', ['constant', 'edge', 'symmetric', 'reflect', 'wrap']
+)
+@pytest.mark.parametrize('dtype', [np.float32, np.float64])
+def test_warp_callable_multichannel(order, mode, dtype):
+    # order <= 1 maps the shared 2-D coordinates onto each band
+    x = cp.random.rand(12, 10, 3).astype(dtype)
+
+    def shift(xy):
+        return xy * 0.8 + 1.3
+
+    outx = warp(x, shift, order=order, mode=mode, cval=0.5)
+    assert outx.dtype == dtype
+    # each band is warped with the same 2-D coordinates
+    coords = cp.asarray(np.concatenate(
+        (np.indices((12, 10, 3), dtype=float)[:2] * 0.8 + 1.3,
+         np.indices((12, 10, 3), dtype=float)[2:]))
+    )
+    expected = map_coordinates(x, coords, order=order, cval=0.5,
+                               mode=_to_ndimage_mode(mode))
+    _clip_warp_output(x, expected, order, mode, 0.5, True)
+    assert_array_almost_equal(outx, expected,
+                              decimal=5 if dtype == np.float32 else 6)
+
+
 @cp.testing.with_requires('cupy>=9.0.0b2')
 def test_warp_matrix():
     x = cp.zeros((5, 5), dtype=np.double)
@@ -79,6 +105,117 @@ def test_warp_matrix():
     outx = warp(x, matrix, order=5)
 
 
+@pytest.mark.parametrize('order', [0, 1, 3])
+@pytest.mark.parametrize('mode', ['constant', 'edge', 'symmetric'])
+@pytest.mark.parametrize('as_inverse', [False, True])
+def test_warp_affine_matrix_path(order, mode, as_inverse):
+    # affine transforms are applied without forming a coordinate array;
+    # compare to interpolation at explicitly computed coordinates
+    x = cp.random.rand(20, 17)
+    tform = AffineTransform(scale=(1.1, 0.9), rotation=0.3, shear=0.2,
+                            translation=(2, -3))
+    inverse_map = tform.inverse if as_inverse else tform
+    outx = warp(x, inverse_map, output_shape=(15, 22), order=order,
+                mode=mode, cval=0.25)
+
+    coords = warp_coords(inverse_map, (15, 22))
+    expected = map_coordinates(x, coords, order=order, cval=0.25,
+                               mode=_to_ndimage_mode(mode))
+    _clip_warp_output(x, expected, order, mode, 0.25, True)
+    assert_array_almost_equal(outx, expected)
+
+
+@pytest.mark.parametrize('order', [0, 1])
+@pytest.mark.parametrize('mode', ['constant', 'edge', 'symmetric', 'reflect'])
+@pytest.mark.parametrize('channels', [1, 3, 4, 5])
+def test_warp_affine_multichannel(order, mode, channels):
+    # all bands share the affine transform of the (row, col) coordinates
+    x = cp.random.rand(20, 17, channels)
+    tform = AffineTransform(scale=(1.1, 0.9), rotation=0.3,
+                            translation=(2, -3))
+    outx = warp(x, tform, output_shape=(15, 22), order=order, mode=mode,
+                cval=0.25)
+    assert outx.shape == (15, 22, channels)
+    for band in range(channels):
+        expected = warp(x[..., band], tform, output_shape=(15, 22),
+                        order=order, mode=mode, cval=0.25)
+        assert_array_almost_equal(outx[..., band], expected)
+
+
+@pytest.mark.parametrize('order', [0, 1, 3])
+@pytest.mark.parametrize('mode', ['constant', 'edge', 'symmetric', 'wrap'])
+@pytest.mark.parametrize('channels', [None, 3])
+@pytest.mark.parametrize(
+    'inverse_map',
+    [AffineTransform(scale=(1.1, 0.9), rotation=0.3, translation=(2, -3)),
+     lambda xy: xy * 0.8 + 1.3]
+)
+def test_warp_batch(order, mode, channels, inverse_map):
+    shape = (4, 20, 17) if channels is None else (4, 20, 17, channels)
+    images = cp.random.rand(*shape)
+    warped = warp_batch(images, inverse_map, output_shape=(15, 22),
+                        order=order, mode=mode, cval=0.25)
+    assert warped.shape == (4, 15, 22) + shape[3:]
+    for image, out in zip(images, warped):
+        expected = warp(image, inverse_map, output_shape=(15, 22),
+                        order=order, mode=mode, cval=0.25)
+        assert_array_almost_equal(out, expected)
+
+
+def test_warp_batch_coords():
+    images = cp.random.rand(3, 10, 12)
+    coords = cp.stack(cp.meshgrid(cp.arange(8) + 0.5, cp.arange(9) * 1.2,
+                                  indexing='ij'))
+    warped = warp_batch(images, coords, order=1)
+    assert warped.shape == (3, 8, 9)
+    for image, out in zip(images, warped):
+        assert_array_almost_equal(out, warp(image, coords, order=1))
+
+    with pytest.raises(ValueError):
+        warp_batch(images[0], coords)
+
+
+@pytest.mark.parametrize('order', [1, 3, 5])
+@pytest.mark.parametrize('shape', [(15, 22), (15, 22, 3)])
+def test_homography_coords(order, shape):
+    matrix = np.array([[1.1, 0.2, 3], [-0.1, 0.9, -2], [1e-3, 2e-3, 1]])
+    tform = ProjectiveTransform(matrix=cp.asarray(matrix))
+    expected = warp_coords(tform, shape)
+    assert_array_almost_equal(_homography_coords(matrix, shape, np.float64),
+                              expected)
+
+    # projective warps use these coordinates for any order
+    x = cp.random.rand(20, 17, *shape[2:])
+    outx = warp(x, tform, output_shape=shape[:2], order=order,
+                mode='symmetric')
+    expected = map_coordinates(x, expected, order=order, mode='reflect')
+    _clip_warp_output(x, expected, order, 'symmetric', 0, True)
+    assert_array_almost_equal(outx, expected)
+
+
+@pytest.mark.parametrize('order', [0, 1, 3])
+@pytest.mark.parametrize('mode', ['constant', 'edge', 'symmetric', 'reflect'])
+@pytest.mark.parametrize('shape', [(20, 17), (20, 17, 3)])
+@pytest.mark.parametrize('translation', [(0, 0), (3, -5), (-20, 17)])
+def test_warp_integer_shift(order, mode, shape, translation):
+    # integer translations (and the identity) slice and pad the input
+    x = cp.random.rand(*shape)
+    tform = AffineTransform(translation=translation)
+    outx = warp(x, tform, output_shape=(15, 22), order=order, mode=mode,
+                cval=0.25)
+    assert outx.shape == (15, 22) + shape[2:]
+
+    coords = warp_coords(tform, (15, 22) + shape[2:])
+    expected = map_coordinates(x, coords, order=order, cval=0.25,
+                               mode=_to_ndimage_mode(mode))
+    assert_array_almost_equal(outx, expected)
+
+    # the output never aliases the input
+    outx = warp(x, tform.inverse, order=order, mode=mode)
+    outx[:] = -1
+    assert x.min() >= 0
+
+
 def test_warp_nd():
     for dim in range(2, 8):
         shape = dim * (5,)
@@ -175,6 +312,65 @@ def test_rotate_resize_center():
         assert_array_equal(x45, ref_x45)
 
 
+@pytest.mark.parametrize('mode', ['constant', 'edge', 'symmetric',
+                                  'reflect', 'wrap'])
+@pytest.mark.parametrize('dtype', [np.float32, np.float64])
+def test_rotate_linear_kernel(mode, dtype):
+    # the specialized order 1 kernel must match ndimage.affine_transform
+    x = cp.random.rand(31, 24).astype(dtype)
+    rotated = rotate(x, 33, resize=True, center=(5, 7), order=1, mode=mode,
+                     cval=0.5, clip=False, preserve_range=True,
+                     allow_float32=True)
+    assert rotated.dtype == dtype
+
+    # reference matrix composed as in scikit-image's rotate
+    center = np.array((5, 7))
+    tform = (SimilarityTransform(translation=-center, xp=np)
+             + SimilarityTransform(rotation=np.deg2rad(33), xp=np)
+             + SimilarityTransform(translation=center, xp=np))
+    corners = np.array([[0, 0], [0, 30], [23, 30], [23, 0]])
+    minc, minr = tform.inverse(corners).min(axis=0)
+    tform = SimilarityTransform(translation=(minc, minr), xp=np) + tform
+    params = tform.params
+    params[:2, :2] = params[:2, :2].T
+    params[:2, 2] = params[1::-1, 2]
+    matrix = cp.asarray(params)
+    expected = ndi.affine_transform(x, matrix, order=1,
+                                    output_shape=rotated.shape,
+                                    mode=_to_ndimage_mode(mode), cval=0.5)
+    assert_array_almost_equal(rotated, expected, decimal=5)
+
+
+@pytest.mark.parametrize('resize', [False, True])
+def test_rotation_affine_for_ndimage(resize):
+    rows, cols = 31, 24
+    center = np.array((5, 7))
+    theta = np.deg2rad(33)
+    matrix, output_shape = _rotation_affine_for_ndimage(theta, center, resize,
+                                                        (rows, cols))
+    assert isinstance(matrix, np.ndarray)
+
+    # compare to the SimilarityTransform composition used by scikit-image
+    tform = (SimilarityTransform(translation=-center, xp=np)
+             + SimilarityTransform(rotation=theta, xp=np)
+             + SimilarityTransform(translation=center, xp=np))
+    if resize:
+        corners = np.array([[0, 0], [0, rows - 1], [cols - 1, rows - 1],
+                            [cols - 1, 0]])
+        corners = tform.inverse(corners)
+        minc, minr = corners.min(axis=0)
+        maxc, maxr = corners.max(axis=0)
+        assert_equal(output_shape,
+                     np.around((maxr - minr + 1, maxc - minc + 1)))
+        tform = SimilarityTransform(translation=(minc, minr), xp=np) + tform
+    else:
+        assert output_shape is None
+    params = tform.params
+    params[:2, :2] = params[:2, :2].T
+    params[:2, 2] = params[1::-1, 2]
+    assert_almost_equal(matrix, params)
+
+
 def test_rotate_resize_90():
     x90 = rotate(cp.zeros((470, 230), dtype=np.double), 90, resize=True)
     assert x90.shape == (230, 470)
@@ -364,6 +560,50 @@ def test_resize_dtype():
     assert resize(x_f32, (10, 10), preserve_range=True).dtype == x_f32.dtype
 
 
+@pytest.mark.parametrize('preserve_range', [False, True])
+@pytest.mark.parametrize(
+    'func, args',
+    [(resize, ((10, 12),)), (rescale, (0.5,)), (rotate, (15,)),
+     (rotate, (15, True)), (warp, (cp.eye(3),)),
+     (warp, (lambda xy: xy * 0.9 + 1.5,)), (warp_polar, ())]
+)
+def test_allow_float32(func, args, preserve_range):
+    x = cp.asarray(checkerboard()[:40, :30])
+    expected = func(x, *args, preserve_range=preserve_range)
+    assert expected.dtype == np.float64
+    out = func(x, *args, preserve_range=preserve_range, allow_float32=True)
+    assert out.dtype == np.float32
+    assert_array_almost_equal(out, expected, decimal=3 if preserve_range
+                              else 5)
+
+    # double precision inputs are not down-cast
+    out = func(x.astype(np.float64), *args, preserve_range=preserve_range,
+               allow_float32=True)
+    assert out.dtype == np.float64
+
+
+@pytest.mark.parametrize('order', [0, 1, 3])
+@pytest.mark.parametrize('channels', [None, 3])
+@pytest.mark.parametrize(
+    'func, args',
+    [(rotate, (15,)), (warp, (AffineTransform(rotation=0.2),)),
+     (warp, (lambda xy: xy * 0.9 + 1.5,)), (warp_polar, ())]
+)
+def test_preserve_range_integer_input(func, args, channels, order):
+    # integer images with preserve_range=True may be interpolated without
+    # first forming a floating point copy
+    x = cp.asarray(checkerboard()[:40, :30])
+    if channels is not None:
+        x = cp.stack((x, x // 2, 255 - x), axis=-1)
+    kwargs = dict(order=order, preserve_range=True)
+    if func is warp_polar and channels is not None:
+        kwargs['multichannel'] = True
+    expected = func(x.astype(np.float64), *args, **kwargs)
+    out = func(x, *args, **kwargs)
+    assert out.dtype == np.float64
+    assert_array_almost_equal(out, expected)
+
+
 @cp.testing.with_requires('cupy>=9.0.0b2')
 def test_swirl():
     image = img_as_float(cp.array(checkerboard()))
@@ -385,6 +625,25 @@ def test_swirl():
     assert cp.mean(cp.abs(image[1:-1, 1:-1] - unswirled[1:-1, 1:-1])) < 0.01
 
 
+@pytest.mark.parametrize('dtype', [np.float32, np.float64])
+def test_swirl_mapping(dtype):
+    xy = cp.random.rand(50, 2).astype(dtype) * 40
+    xy_np = cp.asnumpy(xy).astype(np.float64)
+    out = _swirl_mapping(xy, (20, 15), 0.3, 2, 30)
+    assert out.dtype == dtype
+
+    # NumPy reference implementation from scikit-image
+    x, y = xy_np.T
+    x0, y0 = 20, 15
+    rho = np.sqrt((x - x0) ** 2 + (y - y0) ** 2)
+    radius = 30 / 5 * np.log(2)
+    theta = 0.3 + 2 * np.exp(-rho / radius) + np.arctan2(y - y0, x - x0)
+    expected = np.stack((x0 + rho * np.cos(theta),
+                         y0 + rho * np.sin(theta)), axis=-1)
+    decimal = 4 if dtype == np.float32 else 10
+    assert_array_almost_equal(out, expected, decimal=decimal)
+
+
 def test_const_cval_out_of_range():
     img = cp.random.randn(100, 100)
     cval = -10
@@ -392,6 +651,49 @@ def test_const_cval_out_of_range():
     assert cp.sum(warped == cval) == (2 * 100 * 10 - 10 * 10)
 
 
+@pytest.mark.parametrize('dtype', [np.float32, np.float64])
+@pytest.mark.parametrize('mode', ['constant', 'edge'])
+@pytest.mark.parametrize('cval', [-10, 0.5])
+def test_clip_warp_output(dtype, mode, cval):
+    rng = cp.random.RandomState(0)
+    image = rng.uniform(size=(20, 20)).astype(dtype)
+    output = (3 * rng.uniform(size=(20, 20)) - 1).astype(dtype)
+    output[:2] = cval
+
+    # reference: clip, then restore cval if it is outside the input range
+    min_val, max_val = float(image.min()), float(image.max())
+    expected = cp.clip(output, min_val, max_val)
+    if mode == 'constant' and not (min_val <= cval <= max_val):
+        expected[output == cval] = cval
+
+    _clip_warp_output(image, output, 3, mode, cval, True)
+    assert_array_equal(output, expected)
+
+
+@pytest.mark.parametrize('dtype', [np.float32, np.float64])
+@pytest.mark.parametrize('mode', ['constant', 'edge', 'reflect'])
+def test_linear_warp_output_within_range(dtype, mode):
+    # the bilinear weights need not sum to exactly one in floating point, so
+    # flat regions at the maximum can overshoot without clipping
+    image = cp.ones((40, 30), dtype=dtype)
+    image[10:20, 5:25] = 0.25
+    image[25:35] = cp.linspace(0, 1, 30, dtype=dtype)
+    outputs = [
+        warp(image, AffineTransform(rotation=0.3, translation=(1.7, -2.2)),
+             order=1, mode=mode),
+        warp(image, lambda xy: xy * 0.93 + 0.41, order=1, mode=mode),
+        warp(cp.stack((image, image), axis=-1),
+             AffineTransform(scale=(0.9, 1.1), rotation=-0.2), order=1,
+             mode=mode),
+        rotate(image, 17, order=1, mode=mode),
+        rotate(image, 17, resize=True, order=1, mode=mode),
+        resize(image, (53, 47), order=1, mode=mode),
+    ]
+    for out in outputs:
+        assert out.max() <= image.max()
+        assert out.min() >= image.min()
+
+
 def test_warp_identity():
     img = img_as_float(cp.array(rgb2gray(astronaut())))
     assert len(img.shape) == 2
@@ -418,6 +720,25 @@ def test_warp_coords_example():
     map_coordinates(image[:, :, 0], coords[:2])
 
 
+@pytest.mark.parametrize('shape', [(7, 5), (7, 5, 3)])
+@pytest.mark.parametrize('dtype', [np.float32, np.float64])
+def test_warp_coords_planes(shape, dtype):
+    def shift(xy):
+        return xy + cp.asarray([0.5, -2])
+
+    coords = warp_coords(shift, shape, dtype=dtype)
+    assert coords.shape == (len(shape),) + shape
+    assert coords.dtype == dtype
+    rr, cc = np.mgrid[:shape[0], :shape[1]]
+    if len(shape) == 3:
+        rr = rr[..., np.newaxis]
+        cc = cc[..., np.newaxis]
+        assert_array_equal(coords[2], np.broadcast_to(np.arange(shape[2]),
+                                                      shape))
+    assert_array_equal(coords[0], np.broadcast_to(rr - 2, shape))
+    assert_array_equal(coords[1], np.broadcast_to(cc + 0.5, shape))
+
+
 def test_downsize():
     x = cp.zeros((10, 10), dtype=np.double)
     x[2:4, 2:4] = 1
@@ -428,6 +749,50 @@ def test_downsize():
     assert_equal(float(scaled[:, 2:].sum()), 0)
 
 
+@pytest.mark.parametrize('order', [0, 1])
+@pytest.mark.parametrize('mode', ['constant', 'edge', 'symmetric', 'reflect',
+                                  'wrap'])
+@pytest.mark.parametrize('shape, output_shape',
+                         [((12, 18), (4, 6)), ((12, 18), (6, 9)),
+                          ((15, 20, 3), (5, 4, 3))])
+def test_downsize_integer_factors(order, mode, shape, output_shape):
+    # integer factor down-sampling is done by strided slicing when it is
+    # equivalent to the interpolation
+    x = cp.random.random_sample(shape)
+    ndi_mode = _to_ndimage_mode(mode)
+    ndi_mode = {'constant': 'grid-constant',
+                'wrap': 'grid-wrap'}.get(ndi_mode, ndi_mode)
+    expected = ndi.zoom(x, [so / si for si, so in zip(shape, output_shape)],
+                        order=order, mode=ndi_mode, grid_mode=True)
+    scaled = resize(x, output_shape, order=order, mode=mode,
+                    anti_aliasing=False)
+    assert_array_almost_equal(scaled, expected)
+
+    # the output never aliases the input
+    scaled[:] = -1
+    assert x.min() >= 0
+
+
+@pytest.mark.parametrize('order', [0, 1, 3])
+@pytest.mark.parametrize('dtype', [np.uint8, np.float32, np.float64])
+@pytest.mark.parametrize('preserve_range', [False, True])
+def test_resize_identity(order, dtype, preserve_range):
+    x = cp.asarray(checkerboard()[:20, :30]).astype(dtype)
+    for output_shape in [x.shape, x.shape + (1,)]:
+        scaled = resize(x, output_shape, order=order,
+                        preserve_range=preserve_range)
+        assert scaled.shape == output_shape
+        if preserve_range:
+            expected = x.astype(scaled.dtype)
+        else:
+            expected = img_as_float(x)
+        assert_array_almost_equal(scaled.reshape(x.shape), expected)
+
+        # the output never aliases the input
+        scaled[:] = -1
+        assert x.min() >= 0
+
+
 def test_downsize_anti_aliasing():
     x = cp.zeros((10, 10), dtype=np.double)
     x[2, 2] = 1
@@ -455,6 +820,43 @@ def test_downsize_anti_aliasing():
                anti_aliasing=True, anti_aliasing_sigma=sigma)
 
 
+@pytest.mark.parametrize('order', [0, 1])
+@pytest.mark.parametrize('mode', ['edge', 'symmetric', 'reflect', 'wrap'])
+@pytest.mark.parametrize('output_shape', [(20, 30), (7, 40), (10, 13, 3)])
+def test_downsize_anti_aliasing_separable(order, mode, output_shape):
+    # the per-axis filter + decimate path must match filtering the full
+    # resolution image followed by a single zoom
+    shape = (64, 48, 3) if len(output_shape) == 3 else (33, 48)
+    x = cp.random.random_sample(shape)
+    factors = [si / so for si, so in zip(shape, output_shape)]
+    sigma = [max(0, (f - 1) / 2) for f in factors]
+    filter_mode = {'edge': 'nearest', 'symmetric': 'reflect',
+                   'reflect': 'mirror', 'wrap': 'wrap'}[mode]
+    zoom_mode = _to_ndimage_mode(mode)
+    if zoom_mode == 'wrap':
+        zoom_mode = 'grid-wrap'
+    expected = ndi.zoom(ndi.gaussian_filter(x, sigma, mode=filter_mode),
+                        [1 / f for f in factors], order=order,
+                        mode=zoom_mode, grid_mode=True)
+    scaled = resize(x, output_shape, order=order, mode=mode,
+                    anti_aliasing=True)
+    assert scaled.shape == expected.shape
+    assert_array_almost_equal(scaled, expected)
+
+
+@pytest.mark.parametrize('sigma', [1.5, 5.0, 30.0])
+@pytest.mark.parametrize('mode',
+                         ['constant', 'nearest', 'reflect', 'mirror', 'wrap'])
+@pytest.mark.parametrize('axis', [0, 1])
+def test_gaussian_filter1d(sigma, mode, axis):
+    # large sigmas take the FFT convolution path
+    x = cp.random.random_sample((40, 57))
+    expected = ndi.gaussian_filter1d(x, sigma, axis=axis, mode=mode, cval=0.3)
+    out = _gaussian_filter1d(x, sigma, axis, mode, 0.3)
+    assert out.shape == expected.shape
+    assert_array_almost_equal(out, expected)
+
+
 def test_downsize_anti_aliasing_invalid_stddev():
     x = cp.zeros((10, 10), dtype=np.double)
     with pytest.raises(ValueError):
@@ -606,6 +1008,32 @@ def test_log_polar_mapping():
     assert cp.allclose(coords, ground_truth)
 
 
+@pytest.mark.parametrize('dtype', [np.float32, np.float64])
+@pytest.mark.parametrize('scaling', ['linear', 'log'])
+def test_polar_mapping_dtype(dtype, scaling):
+    output_coords = cp.random.rand(40, 2).astype(dtype) * 50
+    k_angle = 360 / (2 * np.pi)
+    k_radius = 1.5 if scaling == 'linear' else 100 / np.log(100)
+    center = (30.5, 20)
+    if scaling == 'linear':
+        mapping = _linear_polar_mapping
+    else:
+        mapping = _log_polar_mapping
+    coords = mapping(output_coords, k_angle, k_radius, center)
+    assert coords.dtype == dtype
+    assert coords.shape == output_coords.shape
+
+    col, row = cp.asnumpy(output_coords).astype(np.float64).T
+    angle = row / k_angle
+    r = col / k_radius
+    if scaling == 'log':
+        r = np.exp(r)
+    expected = np.stack((r * np.cos(angle) + center[1],
+                         r * np.sin(angle) + center[0]), axis=-1)
+    decimal = 3 if dtype == np.float32 else 10
+    assert_array_almost_equal(coords, expected, decimal=decimal)
+
+
 def test_linear_warp_polar():
     radii = [5, 10, 15, 20]
     image = cp.zeros([51, 51])
@@ -634,6 +1062,32 @@ def test_log_warp_polar():
     assert np.alltrue([x >= 38 and x <= 40 for x in gaps])
 
 
+@pytest.mark.parametrize('scaling', ['linear', 'log'])
+def test_warp_polar_cached_coords(scaling):
+    image = cp.random.rand(40, 50, 3)
+    kwargs = dict(center=(18.5, 22), radius=20, scaling=scaling)
+    warped = warp_polar(image, multichannel=True, **kwargs)
+    hits = _polar_coords.cache_info().hits
+    # the coordinates are reused for every channel and for repeated calls
+    for c in range(3):
+        assert_array_equal(warp_polar(image[..., c], **kwargs),
+                           warped[..., c])
+    assert _polar_coords.cache_info().hits == hits + 3
+
+    # a callable inverse map gives the same result
+    if scaling == 'linear':
+        k_radius = 20 / 20
+        mapping = _linear_polar_mapping
+    else:
+        k_radius = 20 / np.log(20)
+        mapping = _log_polar_mapping
+    map_args = dict(k_angle=360 / (2 * np.pi), k_radius=k_radius,
+                    center=(18.5, 22))
+    expected = warp(image, mapping, map_args=map_args,
+                    output_shape=(360, 20))
+    assert_array_almost_equal(warped, expected)
+
+
 def test_invalid_scaling_polar():
     with pytest.raises(ValueError):
         warp_polar(cp.zeros((10, 10)), (5, 5), scaling="invalid")